@@ -3,6 +3,7 @@ Ansible-specific serializers
 """
 from rest_framework import serializers
 from .models import AnsiblePlaybook, AnsibleInventory, AnsibleExecution, AnsibleExecutionHost
+from .serializers import RawUUIDField
 import json
 
 
@@ -210,8 +211,8 @@ class AnsibleInventoryCreateSerializer(serializers.ModelSerializer):
 
 class AnsibleExecutionCreateSerializer(serializers.Serializer):
     """Serializer for creating AnsibleExecution"""
-    playbook_id = serializers.UUIDField()
-    inventory_id = serializers.UUIDField()
+    playbook_id = RawUUIDField()
+    inventory_id = RawUUIDField()
     extra_vars_dict = serializers.DictField(required=False, default=dict)
     tags_list = serializers.ListField(
         child=serializers.CharField(), required=False, default=list
@@ -223,7 +224,7 @@ class AnsibleExecutionCreateSerializer(serializers.Serializer):
 
 class AnsibleExecutionResponseSerializer(serializers.Serializer):
     """Serializer for AnsibleExecution response"""
-    execution_id = serializers.UUIDField()
+    execution_id = serializers.UUIDField(format='hex_verbose')
     task_id = serializers.CharField()
     message = serializers.CharField()
 
@@ -417,6 +417,8 @@ def execute_ansible_playbook_on_device_task(
         return {
             'success': True,
             'execution_id': str(execution_record.id),
+            'status': execution_record.status,
+            'execution_time': execution_record.execution_time,
             'task_id': f"device_{device_id}_{int(time.time())}",
             'result': result
         }
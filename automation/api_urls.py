@@ -14,6 +14,7 @@ from .api_views import (
 )
 from .generic_automation_views import (
     generic_automation_execute,
+    generic_automation_batch,
     device_playbook_mappings
 )
 from .api_viewsets import (
@@ -100,6 +101,7 @@ urlpatterns = [
     
     # Generic automation endpoint for intelligent routing
     path('automation/generic/', generic_automation_execute, name='generic_automation_execute'),
+    path('automation/generic/batch/', generic_automation_batch, name='generic_automation_batch'),
     path('automation/mappings/', device_playbook_mappings, name='device_playbook_mappings'),
     path('automation/mappings/<uuid:mapping_id>/', device_playbook_mappings, name='device_playbook_mapping_detail'),
     
@@ -2,12 +2,15 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
 from django.db.models import Q
-from .models import Device, Workflow, WorkflowExecution, SystemLog
+from django.http import HttpResponse
+from .models import CommandExecution, Device, Workflow, WorkflowExecution, SystemLog
 from .serializers import (
-    DeviceSerializer, DeviceCreateSerializer, WorkflowSerializer, WorkflowCreateSerializer,
-    WorkflowExecutionSerializer, WorkflowExecutionCreateSerializer,
+    DeviceSerializer, DeviceCreateSerializer, devices_serialize, WorkflowSerializer, WorkflowCreateSerializer,
+    WorkflowExecutionListSerializer, WorkflowExecutionDetailSerializer,
+    WorkflowExecutionCreateSerializer,
     WorkflowExecutionResponseSerializer,
     SystemLogSerializer, PaginatedDeviceSerializer, PaginatedWorkflowSerializer,
     PaginatedExecutionSerializer, PaginatedLogSerializer, ErrorResponseSerializer
@@ -61,10 +64,8 @@ class DeviceViewSet(viewsets.ViewSet):
             paginator = Paginator(devices.order_by('-created_at'), per_page)
             page_obj = paginator.get_page(page)
             
-            serializer = DeviceSerializer(page_obj, many=True)
-            
             return Response({
-                'devices': serializer.data,
+                'devices': devices_serialize(page_obj.object_list),
                 'total': devices.count(),
                 'page': page,
                 'per_page': per_page,
@@ -394,6 +395,12 @@ class ExecutionViewSet(viewsets.ViewSet):
     """
     permission_classes = [AllowAny]
     
+    def get_serializer_class(self):
+        """Use the lightweight serializer for lists, the full one for detail"""
+        if self.action == 'list':
+            return WorkflowExecutionListSerializer
+        return WorkflowExecutionDetailSerializer
+    
     @extend_schema(
         summary="List Executions",
         description="Retrieve a paginated list of workflow executions",
@@ -412,7 +419,9 @@ class ExecutionViewSet(viewsets.ViewSet):
     def list(self, request):
         """List workflow executions with filters and pagination"""
         try:
-            executions = WorkflowExecution.objects.all()
+            executions = WorkflowExecution.objects.select_related(
+                'workflow', 'device', 'created_by'
+            )
             
             # Filters
             status_filter = request.GET.get('status')
@@ -433,7 +442,7 @@ class ExecutionViewSet(viewsets.ViewSet):
             paginator = Paginator(executions.order_by('-created_at'), per_page)
             page_obj = paginator.get_page(page)
             
-            serializer = WorkflowExecutionSerializer(page_obj, many=True)
+            serializer = self.get_serializer_class()(page_obj, many=True)
             
             return Response({
                 'executions': serializer.data,
@@ -451,7 +460,7 @@ class ExecutionViewSet(viewsets.ViewSet):
         summary="Get Execution Detail",
         description="Retrieve detailed information about a specific execution",
         responses={
-            200: WorkflowExecutionSerializer,
+            200: WorkflowExecutionDetailSerializer,
             404: ErrorResponseSerializer,
             500: ErrorResponseSerializer
         }
@@ -459,8 +468,10 @@ class ExecutionViewSet(viewsets.ViewSet):
     def retrieve(self, request, execution_id=None):
         """Get execution details"""
         try:
-            execution = WorkflowExecution.objects.get(id=execution_id)
-            serializer = WorkflowExecutionSerializer(execution)
+            execution = WorkflowExecution.objects.select_related(
+                'workflow', 'device', 'created_by'
+            ).prefetch_related('command_executions').get(id=execution_id)
+            serializer = self.get_serializer_class()(execution)
             return Response(serializer.data)
             
         except WorkflowExecution.DoesNotExist:
@@ -528,6 +539,32 @@ class ExecutionViewSet(viewsets.ViewSet):
             return Response({'error': 'Device not found'}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    @extend_schema(
+        summary="Get Command Output",
+        description="Full output of one command execution as plain text; webhook payloads link here instead of embedding it",
+        responses={
+            200: str,
+            404: ErrorResponseSerializer
+        },
+        parameters=[
+            OpenApiParameter(name='stream', type=str, description="'error' for error_output, otherwise output")
+        ]
+    )
+    @action(detail=True, methods=['get'], url_path=r'commands/(?P<command_id>[^/.]+)/output')
+    def command_output(self, request, pk=None, command_id=None):
+        """Serve a command's output without loading the rest of the row"""
+        field = 'error_output' if request.GET.get('stream') == 'error' else 'output'
+        try:
+            output = CommandExecution.objects.filter(
+                id=command_id, workflow_execution_id=pk
+            ).values_list(field, flat=True).first()
+        except ValidationError:
+            output = None
+        
+        if output is None:
+            return Response({'error': 'Command execution not found'}, status=status.HTTP_404_NOT_FOUND)
+        return HttpResponse(output, content_type='text/plain; charset=utf-8')
 
 
 class LogViewSet(viewsets.ViewSet):
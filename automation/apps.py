@@ -5,3 +5,6 @@ class AutomationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'automation'
     verbose_name = 'Network Automation'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -2,19 +2,30 @@
 Generic automation endpoint that intelligently routes requests to the correct 
 Ansible playbook based on device metadata and workflow type.
 """
+from django.db import transaction
 from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, set_response_etag
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import json
 import time
+import uuid
 from .models import Device, DevicePlaybookMapping, AnsibleExecution, AnsibleInventory, AnsiblePlaybook
 from .ansible_utils import generate_device_inventory
 from .tasks import execute_ansible_playbook_task
 
 
+# Upper bound on items per batch request; each item queues a Celery task
+GENERIC_BATCH_MAX_ITEMS = 50
+
+
 def create_cors_response(data, status=200):
     """Create JSON response with CORS headers"""
-    response = JsonResponse(data, status=status)
+    return _set_cors_headers(JsonResponse(data, status=status))
+
+
+def _set_cors_headers(response):
+    """Add the generic API's CORS headers to a response"""
     response['Access-Control-Allow-Origin'] = '*'
     response['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
     response['Access-Control-Allow-Headers'] = (
@@ -25,6 +36,139 @@ def create_cors_response(data, status=200):
     return response
 
 
+def _get_api_user():
+    """Return the service user that owns API-triggered executions"""
+    from django.contrib.auth.models import User
+    user, created = User.objects.get_or_create(
+        username='api_user',
+        defaults={'email': 'api@example.com'}
+    )
+    return user
+
+
+def _execute_generic_request(data, user=None):
+    """
+    Resolve one generic automation request to a playbook and queue it.
+    Returns a (response_data, status) pair.
+    """
+    hostname = data.get('hostname')
+    workflow_type = data.get('workflow')
+    params = data.get('params', {})
+    
+    # Validate required fields
+    if not hostname or not workflow_type:
+        return {'error': 'hostname and workflow are required'}, 400
+    
+    # Find device by hostname
+    try:
+        device = Device.objects.get(hostname=hostname)
+    except Device.DoesNotExist:
+        return {'error': f'Device with hostname {hostname} not found'}, 404
+    
+    # Find matching device-playbook mapping
+    mappings = DevicePlaybookMapping.objects.filter(
+        workflow_type=workflow_type,
+        is_active=True
+    ).order_by('-priority')
+    
+    # Find the best matching mapping
+    matching_mapping = None
+    for mapping in mappings:
+        if mapping.matches_device(device):
+            matching_mapping = mapping
+            break
+    
+    if not matching_mapping:
+        return ({
+            'error': f'No active playbook mapping found for workflow type "{workflow_type}" and device {hostname} ({device.vendor} {device.model} {device.os_version})'
+        }, 404)
+    
+    # Validate required parameters for this mapping
+    required_params = matching_mapping.get_required_params()
+    missing_params = [param for param in required_params if param not in params]
+    
+    if missing_params:
+        return ({
+            'error': f'Missing required parameters: {missing_params}',
+            'required_params': required_params
+        }, 400)
+    
+    # Merge default variables with provided parameters
+    default_vars = matching_mapping.get_default_variables()
+    final_variables = {**default_vars, **params}
+    final_variables.update({
+        'device_name': device.name,
+        'device_hostname': device.hostname or device.name,
+        'device_ip': device.ip_address,
+        'device_type': device.device_type,
+        'device_vendor': device.vendor or "unknown",
+        'device_model': device.model or "unknown",
+        'workflow_type': workflow_type
+    })
+    
+    # Create Ansible execution record
+    if user is None:
+        user = _get_api_user()
+    
+    # Create temporary inventory for this device
+    inventory_content = generate_device_inventory(device)
+    
+    # Create temporary inventory and execution records together, so a
+    # failure doesn't leave an orphaned inventory behind. The name suffix
+    # keeps it unique when one batch targets the same device twice; the
+    # device name is trimmed to stay within the 100 character limit.
+    with transaction.atomic():
+        temp_inventory = AnsibleInventory.objects.create(
+            name=f"Temp_Inventory_{device.name[:60]}_{int(time.time())}_{uuid.uuid4().hex[:8]}",
+            description=f"Temporary inventory for device {device.name}",
+            inventory_content=inventory_content,
+            is_temporary=True,  # Mark as temporary to hide from UI
+            created_by=user
+        )
+        
+        execution_record = AnsibleExecution.objects.create(
+            playbook=matching_mapping.playbook,
+            inventory=temp_inventory,
+            status='pending',
+            created_by=user
+        )
+        
+        # Set extra variables
+        execution_record.set_extra_vars(final_variables)
+        execution_record.save()
+    
+    # Start async execution once the records are committed
+    task = execute_ansible_playbook_task.delay(str(execution_record.id))
+    
+    # Return success response
+    return ({
+        'execution_id': str(execution_record.id),
+        'task_id': task.id,
+        'message': 'Generic automation execution started successfully',
+        'device_info': {
+            'hostname': device.hostname,
+            'name': device.name,
+            'ip_address': device.ip_address,
+            'device_type': device.device_type,
+            'vendor': device.vendor,
+            'model': device.model,
+            'os_version': device.os_version
+        },
+        'playbook_info': {
+            'id': str(matching_mapping.playbook.id),
+            'name': matching_mapping.playbook.name,
+            'description': matching_mapping.playbook.description
+        },
+        'workflow_type': workflow_type,
+        'mapping_used': {
+            'id': str(matching_mapping.id),
+            'name': matching_mapping.name,
+            'priority': matching_mapping.priority
+        },
+        'variables_used': final_variables
+    }, 202)
+
+
 @csrf_exempt
 @require_http_methods(["POST", "OPTIONS"])
 def generic_automation_execute(request):
@@ -53,125 +197,65 @@ def generic_automation_execute(request):
     
     try:
         data = json.loads(request.body)
-        hostname = data.get('hostname')
-        workflow_type = data.get('workflow')
-        params = data.get('params', {})
+        response_data, status = _execute_generic_request(data)
+        return create_cors_response(response_data, status=status)
         
-        # Validate required fields
-        if not hostname or not workflow_type:
+    except json.JSONDecodeError:
+        return create_cors_response({'error': 'Invalid JSON data'}, status=400)
+    except Exception as e:
+        return create_cors_response({'error': str(e)}, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["POST", "OPTIONS"])
+def generic_automation_batch(request):
+    """
+    Run several generic automation requests in one round trip.
+    
+    Expected JSON payload:
+    {
+        "items": [
+            {"hostname": "sw-core-01", "workflow": "reboot", "params": {}},
+            ...
+        ]
+    }
+    
+    Returns one {"status", "result"} entry per item, in request order.
+    """
+    # Handle CORS preflight request
+    if request.method == 'OPTIONS':
+        response = JsonResponse({})
+        response['Access-Control-Allow-Origin'] = '*'
+        response['Access-Control-Allow-Methods'] = 'POST, OPTIONS'
+        response['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
+        response['Access-Control-Max-Age'] = '86400'
+        return response
+    
+    try:
+        data = json.loads(request.body)
+        items = data.get('items')
+        if not isinstance(items, list):
             return create_cors_response({
-                'error': 'hostname and workflow are required'
+                'error': 'items must be a list of generic automation requests'
             }, status=400)
-        
-        # Find device by hostname
-        try:
-            device = Device.objects.get(hostname=hostname)
-        except Device.DoesNotExist:
-            return create_cors_response({
-                'error': f'Device with hostname {hostname} not found'
-            }, status=404)
-        
-        # Find matching device-playbook mapping
-        mappings = DevicePlaybookMapping.objects.filter(
-            workflow_type=workflow_type,
-            is_active=True
-        ).order_by('-priority')
-        
-        # Find the best matching mapping
-        matching_mapping = None
-        for mapping in mappings:
-            if mapping.matches_device(device):
-                matching_mapping = mapping
-                break
-        
-        if not matching_mapping:
-            return create_cors_response({
-                'error': f'No active playbook mapping found for workflow type "{workflow_type}" and device {hostname} ({device.vendor} {device.model} {device.os_version})'
-            }, status=404)
-        
-        # Validate required parameters for this mapping
-        required_params = matching_mapping.get_required_params()
-        missing_params = [param for param in required_params if param not in params]
-        
-        if missing_params:
+        if len(items) > GENERIC_BATCH_MAX_ITEMS:
             return create_cors_response({
-                'error': f'Missing required parameters: {missing_params}',
-                'required_params': required_params
+                'error': f'A batch may contain at most {GENERIC_BATCH_MAX_ITEMS} items'
             }, status=400)
         
-        # Merge default variables with provided parameters
-        default_vars = matching_mapping.get_default_variables()
-        final_variables = {**default_vars, **params}
-        final_variables.update({
-            'device_name': device.name,
-            'device_hostname': device.hostname or device.name,
-            'device_ip': device.ip_address,
-            'device_type': device.device_type,
-            'device_vendor': device.vendor or "unknown",
-            'device_model': device.model or "unknown",
-            'workflow_type': workflow_type
-        })
-        
-        # Create Ansible execution record
-        from django.contrib.auth.models import User
-        user, created = User.objects.get_or_create(
-            username='api_user',
-            defaults={'email': 'api@example.com'}
-        )
-        
-        # Create temporary inventory for this device
-        inventory_content = generate_device_inventory(device)
-        
-        # Create temporary inventory and execution records
-        temp_inventory = AnsibleInventory.objects.create(
-            name=f"Temp_Inventory_{device.name}_{int(time.time())}",
-            description=f"Temporary inventory for device {device.name}",
-            inventory_content=inventory_content,
-            is_temporary=True,  # Mark as temporary to hide from UI
-            created_by=user
-        )
-        
-        execution_record = AnsibleExecution.objects.create(
-            playbook=matching_mapping.playbook,
-            inventory=temp_inventory,
-            status='pending',
-            created_by=user
-        )
-        
-        # Set extra variables
-        execution_record.set_extra_vars(final_variables)
-        execution_record.save()
-        
-        # Start async execution
-        task = execute_ansible_playbook_task.delay(str(execution_record.id))
+        user = _get_api_user()
+        results = []
+        for item in items:
+            if not isinstance(item, dict):
+                result, status = {'error': 'Each item must be a JSON object'}, 400
+            else:
+                try:
+                    result, status = _execute_generic_request(item, user)
+                except Exception as e:
+                    result, status = {'error': str(e)}, 500
+            results.append({'status': status, 'result': result})
         
-        # Return success response
-        return create_cors_response({
-            'execution_id': str(execution_record.id),
-            'task_id': task.id,
-            'message': 'Generic automation execution started successfully',
-            'device_info': {
-                'hostname': device.hostname,
-                'name': device.name,
-                'ip_address': device.ip_address,
-                'device_type': device.device_type,
-                'vendor': device.vendor,
-                'model': device.model,
-                'os_version': device.os_version
-            },
-            'playbook_info': {
-                'id': str(matching_mapping.playbook.id),
-                'name': matching_mapping.playbook.name,
-                'description': matching_mapping.playbook.description
-            },
-            'workflow_type': workflow_type,
-            'mapping_used': {
-                'id': str(matching_mapping.id),
-                'name': matching_mapping.name,
-                'priority': matching_mapping.priority
-            },
-            'variables_used': final_variables
-        }, status=202)
+        return create_cors_response({'results': results})
         
     except json.JSONDecodeError:
         return create_cors_response({'error': 'Invalid JSON data'}, status=400)
@@ -239,10 +323,17 @@ def device_playbook_mappings(request, mapping_id=None):
                 }
                 mapping_list.append(mapping_data)
             
-            return create_cors_response({
+            response = create_cors_response({
                 'mappings': mapping_list,
                 'total': mappings.count()
             })
+            # Tag the list so clients can revalidate with If-None-Match and
+            # get a bodiless 304 when nothing changed
+            set_response_etag(response)
+            # A 304 is a fresh response; it needs the CORS headers too
+            return _set_cors_headers(get_conditional_response(
+                request, etag=response['ETag'], response=response
+            ))
         
         # Handle POST request - create new mapping
         elif request.method == 'POST':
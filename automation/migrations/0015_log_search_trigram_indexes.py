@@ -0,0 +1,48 @@
+# Generated migration for trigram indexes on searchable log columns
+from django.db import migrations
+
+
+# (index name, table, column) for every column the unified log search
+# filters with __icontains
+TRIGRAM_INDEXES = [
+    ('automation_systemlog_message_trgm', 'automation_systemlog', 'message'),
+    ('automation_systemlog_details_trgm', 'automation_systemlog', 'details'),
+    ('automation_ansibleexecution_stdout_trgm', 'automation_ansibleexecution', 'stdout'),
+    ('automation_ansibleexecution_stderr_trgm', 'automation_ansibleexecution', 'stderr'),
+    ('automation_commandexecution_command_trgm', 'automation_commandexecution', 'command'),
+    ('automation_commandexecution_output_trgm', 'automation_commandexecution', 'output'),
+    ('automation_commandexecution_error_output_trgm', 'automation_commandexecution', 'error_output'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """pg_trgm GIN indexes let ILIKE '%term%' use an index; PostgreSQL only"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+            f'ON {table} USING GIN (UPPER({column}) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('automation', '0013_remove_deviceprofile_created_by_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
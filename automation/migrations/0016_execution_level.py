@@ -0,0 +1,44 @@
+# Generated migration for persisted log levels on execution models
+from django.db import migrations, models
+from django.db.models import Case, Q, Value, When
+
+
+def populate_levels(apps, schema_editor):
+    """Backfill level with one UPDATE per table"""
+    levels = [
+        ('AnsibleExecution', Q(return_code__gt=0)),
+        ('WorkflowExecution', Q(status__in=['failed', 'rolled_back'])),
+        ('CommandExecution', Q(status='failed')),
+    ]
+    for model_name, error_condition in levels:
+        model = apps.get_model('automation', model_name)
+        model.objects.update(level=Case(
+            When(error_condition, then=Value('ERROR')),
+            default=Value('INFO'),
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0015_log_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ansibleexecution',
+            name='level',
+            field=models.CharField(db_index=True, default='INFO', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='workflowexecution',
+            name='level',
+            field=models.CharField(db_index=True, default='INFO', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='commandexecution',
+            name='level',
+            field=models.CharField(db_index=True, default='INFO', max_length=10),
+        ),
+        migrations.RunPython(populate_levels, migrations.RunPython.noop),
+    ]
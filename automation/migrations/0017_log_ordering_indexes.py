@@ -0,0 +1,28 @@
+# Generated migration for (timestamp, id) ordering indexes on log sources
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0016_execution_level'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='systemlog',
+            index=models.Index(fields=['-created_at', '-id'], name='syslog_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ansibleexecution',
+            index=models.Index(fields=['-created_at', '-id'], name='ansexec_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowexecution',
+            index=models.Index(fields=['-created_at', '-id'], name='wfexec_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='commandexecution',
+            index=models.Index(fields=['-started_at', '-id'], name='cmdexec_started_id_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated migration for stored workflow execution time
+from django.db import migrations, models
+
+
+def populate_execution_time(apps, schema_editor):
+    """Backfill execution_time for finished executions"""
+    WorkflowExecution = apps.get_model('automation', 'WorkflowExecution')
+    finished = WorkflowExecution.objects.filter(
+        started_at__isnull=False, completed_at__isnull=False
+    ).only('id', 'started_at', 'completed_at')
+    
+    batch = []
+    for execution in finished.iterator(chunk_size=1000):
+        execution.execution_time = (execution.completed_at - execution.started_at).total_seconds()
+        batch.append(execution)
+        if len(batch) >= 1000:
+            WorkflowExecution.objects.bulk_update(batch, ['execution_time'])
+            batch = []
+    if batch:
+        WorkflowExecution.objects.bulk_update(batch, ['execution_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0017_log_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workflowexecution',
+            name='execution_time',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(populate_execution_time, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated migration backfilling command execution start times
+from django.db import migrations
+from django.db.models import F
+
+
+def populate_started_at(apps, schema_editor):
+    """Use completed_at as the start time of commands that failed before starting"""
+    CommandExecution = apps.get_model('automation', 'CommandExecution')
+    CommandExecution.objects.filter(
+        started_at__isnull=True, completed_at__isnull=False
+    ).update(started_at=F('completed_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0018_workflowexecution_execution_time'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_started_at, migrations.RunPython.noop),
+    ]
@@ -5,6 +5,13 @@ import json
 import uuid
 
 
+def _with_derived_field(update_fields, source_field, derived_field):
+    """Add a derived field to a partial save's update_fields when its source field is saved"""
+    if update_fields is None or source_field not in update_fields or derived_field in update_fields:
+        return update_fields
+    return list(update_fields) + [derived_field]
+
+
 class Device(models.Model):
     """Model for network devices that can be automated"""
     DEVICE_TYPES = [
@@ -216,9 +223,24 @@ class WorkflowExecution(models.Model):
     
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Log level derived from status in save(); indexed for unified log filtering
+    level = models.CharField(max_length=10, default='INFO', db_index=True)
+    # Seconds from started_at to completed_at, set in save()
+    execution_time = models.FloatField(null=True, blank=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='wfexec_created_id_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        self.level = 'ERROR' if self.status in ('failed', 'rolled_back') else 'INFO'
+        if self.started_at and self.completed_at:
+            self.execution_time = (self.completed_at - self.started_at).total_seconds()
+        update_fields = _with_derived_field(kwargs.get('update_fields'), 'status', 'level')
+        kwargs['update_fields'] = _with_derived_field(update_fields, 'completed_at', 'execution_time')
+        super().save(*args, **kwargs)
     
     def get_pre_check_results(self):
         """Parse JSON results from text field"""
@@ -229,7 +251,7 @@ class WorkflowExecution(models.Model):
     
     def set_pre_check_results(self, results):
         """Store results as JSON in text field"""
-        self.pre_check_results = json.dumps(results)
+        self.pre_check_results = json.dumps(results, separators=(',', ':'))
     
     def get_implementation_results(self):
         """Parse JSON results from text field"""
@@ -240,7 +262,7 @@ class WorkflowExecution(models.Model):
     
     def set_implementation_results(self, results):
         """Store results as JSON in text field"""
-        self.implementation_results = json.dumps(results)
+        self.implementation_results = json.dumps(results, separators=(',', ':'))
     
     def get_post_check_results(self):
         """Parse JSON results from text field"""
@@ -251,7 +273,7 @@ class WorkflowExecution(models.Model):
     
     def set_post_check_results(self, results):
         """Store results as JSON in text field"""
-        self.post_check_results = json.dumps(results)
+        self.post_check_results = json.dumps(results, separators=(',', ':'))
     
     def get_rollback_results(self):
         """Parse JSON results from text field"""
@@ -262,7 +284,7 @@ class WorkflowExecution(models.Model):
     
     def set_rollback_results(self, results):
         """Store results as JSON in text field"""
-        self.rollback_results = json.dumps(results)
+        self.rollback_results = json.dumps(results, separators=(',', ':'))
 
     def get_dynamic_params(self):
         """Parse JSON dynamic params from text field"""
@@ -307,9 +329,23 @@ class CommandExecution(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     validation_result = models.TextField(blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Log level derived from status; indexed for unified log filtering
+    level = models.CharField(max_length=10, default='INFO', db_index=True)
     
     class Meta:
         ordering = ['started_at']
+        indexes = [
+            models.Index(fields=['-started_at', '-id'], name='cmdexec_started_id_idx'),
+        ]
+    
+    def set_level(self):
+        """Derive level from status; call before bulk_create, which skips save()"""
+        self.level = 'ERROR' if self.status == 'failed' else 'INFO'
+    
+    def save(self, *args, **kwargs):
+        self.set_level()
+        kwargs['update_fields'] = _with_derived_field(kwargs.get('update_fields'), 'status', 'level')
+        super().save(*args, **kwargs)
     
     def __str__(self):
         return f"{self.stage}: {self.command[:50]}..."
@@ -355,6 +391,7 @@ class SystemLog(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['-created_at']),
+            models.Index(fields=['-created_at', '-id'], name='syslog_created_id_idx'),
             models.Index(fields=['level']),
             models.Index(fields=['type']),
             models.Index(fields=['object_type', 'object_id']),
@@ -788,9 +825,19 @@ class AnsibleExecution(models.Model):
     
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Log level derived from return_code in save(); indexed for unified log filtering
+    level = models.CharField(max_length=10, default='INFO', db_index=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='ansexec_created_id_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        self.level = 'ERROR' if self.return_code and self.return_code > 0 else 'INFO'
+        kwargs['update_fields'] = _with_derived_field(kwargs.get('update_fields'), 'return_code', 'level')
+        super().save(*args, **kwargs)
     
     def get_extra_vars(self):
         """Parse JSON extra vars from text field"""
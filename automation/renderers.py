@@ -0,0 +1,30 @@
+"""
+Faster JSON rendering for large API payloads
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    # orjson serializes datetimes, UUIDs and dataclasses natively and is
+    # several times faster than the stdlib encoder on log payloads
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that uses orjson when installed, falling back to DRF's encoder"""
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        # Indented output for the browsable/pretty-printed case stays on the stdlib path
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        # OPT_UTC_Z matches DRF's 'Z' suffix for UTC datetimes
+        return orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        )
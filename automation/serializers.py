@@ -1,3 +1,6 @@
+import uuid
+
+from django.db.models import F
 from rest_framework import serializers
 from .models import (
     Device, Workflow, WorkflowExecution, SystemLog, CommandExecution,
@@ -6,6 +9,19 @@ from .models import (
 )
 
 
+class RawUUIDField(serializers.UUIDField):
+    """UUIDField that also accepts raw 16-byte values without string parsing"""
+    
+    def __init__(self, **kwargs):
+        kwargs.setdefault('format', 'hex_verbose')
+        super().__init__(**kwargs)
+    
+    def to_internal_value(self, data):
+        if isinstance(data, (bytes, bytearray, memoryview)) and len(data) == 16:
+            return uuid.UUID(bytes=bytes(data))
+        return super().to_internal_value(data)
+
+
 class DeviceCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating Device model with custom created_by handling"""
     created_by_username = serializers.CharField(
@@ -54,6 +70,26 @@ class DeviceSerializer(serializers.ModelSerializer):
         }
 
 
+DEVICE_LIST_FIELDS = (
+    'id', 'name', 'hostname', 'ip_address', 'device_type', 'status',
+    'ssh_port', 'vendor', 'model', 'os_version', 'location',
+    'description', 'created_by', 'created_at', 'updated_at'
+)
+
+
+def devices_serialize(queryset):
+    """
+    Serialize devices for list endpoints straight from the database row.
+    
+    Produces the same keys as DeviceSerializer but skips per-instance
+    field binding; keep DeviceSerializer for detail and write paths.
+    """
+    return list(queryset.values(
+        *DEVICE_LIST_FIELDS,
+        created_by_username=F('created_by__username')
+    ))
+
+
 class CommandExecutionSerializer(serializers.ModelSerializer):
     """Serializer for CommandExecution model"""
     
@@ -66,8 +102,8 @@ class CommandExecutionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'started_at', 'completed_at']
 
 
-class WorkflowExecutionSerializer(serializers.ModelSerializer):
-    """Serializer for WorkflowExecution model"""
+class WorkflowExecutionListSerializer(serializers.ModelSerializer):
+    """Serializer for WorkflowExecution list output (without command executions)"""
     workflow_name = serializers.CharField(source='workflow.name', read_only=True)
     device_name = serializers.CharField(source='device.name', read_only=True)
     device_ip_address = serializers.CharField(
@@ -76,7 +112,6 @@ class WorkflowExecutionSerializer(serializers.ModelSerializer):
     created_by_username = serializers.CharField(
         source='created_by.username', read_only=True
     )
-    command_executions = CommandExecutionSerializer(many=True, read_only=True)
     
     class Meta:
         model = WorkflowExecution
@@ -85,12 +120,24 @@ class WorkflowExecutionSerializer(serializers.ModelSerializer):
             'device_ip_address', 'status', 'current_stage', 'started_at', 
             'completed_at', 'error_message', 'pre_check_results', 
             'implementation_results', 'post_check_results', 'rollback_results',
-            'created_by', 'created_by_username', 'created_at', 
-            'command_executions'
+            'created_by', 'created_by_username', 'created_at'
         ]
         read_only_fields = [
             'id', 'workflow_name', 'device_name', 'device_ip_address', 
-            'created_by_username', 'created_at', 'command_executions'
+            'created_by_username', 'created_at'
+        ]
+
+
+class WorkflowExecutionDetailSerializer(WorkflowExecutionListSerializer):
+    """Serializer for WorkflowExecution detail output (with command executions)"""
+    command_executions = CommandExecutionSerializer(many=True, read_only=True)
+    
+    class Meta(WorkflowExecutionListSerializer.Meta):
+        fields = WorkflowExecutionListSerializer.Meta.fields + [
+            'command_executions'
+        ]
+        read_only_fields = WorkflowExecutionListSerializer.Meta.read_only_fields + [
+            'command_executions'
         ]
 
 
@@ -160,13 +207,21 @@ class WorkflowSerializer(serializers.ModelSerializer):
             'rollback': count_commands(obj.get_rollback_commands())
         }
     
+    def _required_dynamic_params(self, obj):
+        """Parse required dynamic params once per workflow instance"""
+        params = obj.__dict__.get('_required_dynamic_params_cache')
+        if params is None:
+            params = obj.get_required_dynamic_params()
+            obj.__dict__['_required_dynamic_params_cache'] = params
+        return params
+    
     def get_required_dynamic_params(self, obj):
         """Get list of commands that require dynamic parameters"""
-        return obj.get_required_dynamic_params()
+        return self._required_dynamic_params(obj)
     
     def get_has_dynamic_params(self, obj):
         """Check if workflow has any dynamic parameters"""
-        params = obj.get_required_dynamic_params()
+        params = self._required_dynamic_params(obj)
         return len(params) > 0 if params else False
     
     def get_has_bpmn(self, obj):
@@ -258,7 +313,7 @@ class SystemLogSerializer(serializers.ModelSerializer):
     
     def get_diff_html(self, obj):
         """Get diff HTML if available"""
-        return obj.get_diff_html() if hasattr(obj, 'get_diff_html') else None
+        return obj.get_diff_html()
     
     def get_has_changes(self, obj):
         """Check if there are any changes"""
@@ -298,7 +353,7 @@ class PaginatedWorkflowSerializer(serializers.Serializer):
 
 class PaginatedExecutionSerializer(serializers.Serializer):
     """Serializer for paginated execution responses"""
-    executions = WorkflowExecutionSerializer(many=True)
+    executions = WorkflowExecutionListSerializer(many=True)
     total = serializers.IntegerField()
     page = serializers.IntegerField()
     per_page = serializers.IntegerField()
@@ -318,14 +373,14 @@ class PaginatedLogSerializer(serializers.Serializer):
 
 class WorkflowExecutionCreateSerializer(serializers.Serializer):
     """Serializer for workflow execution request"""
-    workflow_id = serializers.UUIDField()
-    device_id = serializers.UUIDField()
+    workflow_id = RawUUIDField()
+    device_id = RawUUIDField()
     dynamic_params = serializers.DictField(required=False, default=dict)
 
 
 class WorkflowExecutionResponseSerializer(serializers.Serializer):
     """Serializer for workflow execution response"""
-    execution_id = serializers.UUIDField()
+    execution_id = serializers.UUIDField(format='hex_verbose')
     task_id = serializers.CharField()
     message = serializers.CharField()
 
@@ -641,8 +696,8 @@ class AnsibleInventoryCreateSerializer(serializers.ModelSerializer):
 
 class AnsibleExecutionCreateSerializer(serializers.Serializer):
     """Serializer for creating AnsibleExecution"""
-    playbook_id = serializers.UUIDField()
-    inventory_id = serializers.UUIDField()
+    playbook_id = RawUUIDField()
+    inventory_id = RawUUIDField()
     extra_vars_dict = serializers.DictField(required=False, default=dict)
     tags_list = serializers.ListField(
         child=serializers.CharField(), required=False, default=list
@@ -654,7 +709,7 @@ class AnsibleExecutionCreateSerializer(serializers.Serializer):
 
 class AnsibleExecutionResponseSerializer(serializers.Serializer):
     """Serializer for AnsibleExecution response"""
-    execution_id = serializers.UUIDField()
+    execution_id = serializers.UUIDField(format='hex_verbose')
     task_id = serializers.CharField()
     message = serializers.CharField()
 
@@ -786,7 +841,7 @@ class GenericAutomationRequestSerializer(serializers.Serializer):
 
 class GenericAutomationResponseSerializer(serializers.Serializer):
     """Serializer for generic automation response"""
-    execution_id = serializers.UUIDField()
+    execution_id = serializers.UUIDField(format='hex_verbose')
     task_id = serializers.CharField()
     message = serializers.CharField()
     device_info = serializers.DictField()
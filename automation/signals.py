@@ -0,0 +1,25 @@
+"""
+Model signal handlers for the automation app
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import AnsibleExecution, WebhookConfiguration, WorkflowExecution
+from .unified_log_utils import invalidate_recent_executions_cache
+from .webhook_utils import invalidate_active_webhooks_cache
+
+
+@receiver([post_save, post_delete], sender=AnsibleExecution)
+@receiver([post_save, post_delete], sender=WorkflowExecution)
+def invalidate_recent_executions(sender, **kwargs):
+    """
+    Drop cached recent-executions lists when an execution changes.
+    Queryset .update() and bulk_create() send no signals; code that changes
+    executions that way must call invalidate_recent_executions_cache().
+    """
+    invalidate_recent_executions_cache()
+
+
+@receiver([post_save, post_delete], sender=WebhookConfiguration)
+def invalidate_active_webhooks(sender, **kwargs):
+    """Drop the cached active webhook list when a configuration changes"""
+    invalidate_active_webhooks_cache()
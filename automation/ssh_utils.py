@@ -2,11 +2,100 @@ import paramiko
 import time
 import logging
 import os
+import re
+import selectors
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from django.conf import settings
-from paramiko.ssh_exception import SSHException, AuthenticationException
+from paramiko.ssh_exception import SSHException, AuthenticationException, BadHostKeyException
+
+try:
+    # google-re2 matches in linear time, so user-supplied validation
+    # patterns cannot backtrack catastrophically on large outputs
+    import re2
+except ImportError:
+    re2 = None
 
 logger = logging.getLogger(__name__)
 
+# Default CLI prompt: line ending in '>' (user mode) or '#' (enable mode)
+PROMPT_REGEX = r'[>#]\s*$'
+PASSWORD_PROMPT_REGEX = r'[Pp]assword:\s*$'
+# Privileged exec prompt, e.g. 'router#' but not 'router(config)#'
+ENABLE_PROMPT_REGEX = r'^[^\s()]+#\s*$'
+
+SSH_WINDOW_SIZE = 2 * 1024 * 1024
+SSH_MAX_PACKET_SIZE = 256 * 1024
+RECV_CHUNK_SIZE = 65536
+
+# Read-only commands that can run on a one-shot exec channel instead of the shell
+EXEC_COMMAND_PREFIXES = ('show ', 'display ', 'ping ', 'traceroute ')
+
+
+# Host keys shared by every connection in this process. The system and
+# project known_hosts files are read once at import; keys learned here are
+# merged back into the project file as soon as they are seen, since Celery's
+# prefork children exit without running atexit handlers.
+_known_hosts = paramiko.HostKeys()
+_system_host_keys = paramiko.HostKeys()
+_new_host_keys = paramiko.HostKeys()
+_known_hosts_lock = threading.Lock()
+
+
+def _load_host_keys(host_keys, path):
+    """Add the keys in a known_hosts file, if it exists"""
+    if path and os.path.exists(path):
+        try:
+            host_keys.load(path)
+        except IOError as e:
+            logger.warning(f"Could not read known_hosts {path}: {e}")
+
+
+def _check_host_key(host, key):
+    """
+    Raise BadHostKeyException if a device's key changed; remember and save
+    keys of new devices
+    """
+    with _known_hosts_lock:
+        for host_keys in (_known_hosts, _system_host_keys):
+            known = host_keys.lookup(host)
+            if known is not None and key.get_name() in known:
+                expected = known[key.get_name()]
+                if expected.asbytes() != key.asbytes():
+                    raise BadHostKeyException(host, key, expected)
+                return
+        _known_hosts.add(host, key.get_name(), key)
+        _new_host_keys.add(host, key.get_name(), key)
+    _save_known_hosts()
+
+
+def _save_known_hosts():
+    """Merge this process's new host keys into the known_hosts file"""
+    path = getattr(settings, 'SSH_KNOWN_HOSTS_PATH', None)
+    with _known_hosts_lock:
+        if not path or not len(_new_host_keys):
+            return
+        # Re-read the file so keys saved by other workers are kept, then
+        # swap it in atomically so readers never see a partial file
+        merged = paramiko.HostKeys()
+        _load_host_keys(merged, path)
+        for host, keys in _new_host_keys.items():
+            for key_type, key in keys.items():
+                merged.add(host, key_type, key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            merged.save(tmp_path)
+            os.replace(tmp_path, path)
+        except (IOError, OSError) as e:
+            logger.warning(f"Could not write known_hosts {path}: {e}")
+
+
+_load_host_keys(_system_host_keys, os.path.expanduser('~/.ssh/known_hosts'))
+_load_host_keys(_known_hosts, getattr(settings, 'SSH_KNOWN_HOSTS_PATH', None))
+
 
 class SSHConnection:
     """SSH connection handler for network devices"""
@@ -20,12 +109,19 @@ class SSHConnection:
         self.enable_password = enable_password
         self.client = None
         self.shell = None
+        self._selector = None
         self.connected = False
+        # False once the enable step failed; such a session is never pooled
+        self.poolable = True
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
     
     def connect(self):
         """Establish SSH connection to the device"""
         try:
             self.client = paramiko.SSHClient()
+            # The key is checked against the shared in-memory known hosts
+            # after the handshake; new devices are accepted and remembered
             self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             
             self.client.connect(
@@ -35,17 +131,39 @@ class SSHConnection:
                 password=self.password,
                 timeout=self.timeout,
                 look_for_keys=False,
-                allow_agent=False
+                allow_agent=False,
+                compress=True
             )
             
+            transport = self.client.get_transport()
+            remote_key = transport.get_remote_server_key()
+            host = self.hostname if self.port == 22 else f"[{self.hostname}]:{self.port}"
+            _check_host_key(host, remote_key)
+            
+            # Larger channel windows let bulk output (show tech, routing
+            # tables) stream with fewer window-adjust round trips
+            transport.default_window_size = SSH_WINDOW_SIZE
+            transport.default_max_packet_size = SSH_MAX_PACKET_SIZE
+            
             self.shell = self.client.invoke_shell()
+            self.shell.settimeout(0.0)
+            # Wait on the channel's readiness pipe instead of polling recv()
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self.shell, selectors.EVENT_READ)
             self.connected = True
+            
+            # Consume the login banner up to the first prompt
+            self._read_until(PROMPT_REGEX)
             logger.info(f"Successfully connected to {self.hostname}")
             return True
             
         except AuthenticationException:
             logger.error(f"Authentication failed for {self.hostname}")
             return False
+        except BadHostKeyException as e:
+            logger.error(f"Host key mismatch for {self.hostname}: {e}")
+            self.client.close()
+            return False
         except SSHException as e:
             logger.error(f"SSH connection failed for {self.hostname}: {e}")
             return False
@@ -53,22 +171,80 @@ class SSHConnection:
             logger.error(f"Connection failed for {self.hostname}: {e}")
             return False
     
-    def execute_command(self, command, wait_time=2):
+    def _read_until(self, prompt_regex, timeout=None, idle_timeout=2.0):
+        """
+        Read from the shell until the prompt regex matches the tail of the output.
+        
+        Stops early once data has arrived and the channel then stays quiet
+        for idle_timeout seconds, or when the overall timeout elapses.
+        """
+        prompt_re = re.compile(prompt_regex.encode())
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        last_data = None
+        buf = bytearray()
+        
+        while True:
+            now = time.monotonic()
+            wait = deadline - now
+            if last_data is not None:
+                wait = min(wait, last_data + idle_timeout - now)
+            if wait <= 0:
+                break
+            if not self._selector.select(timeout=min(wait, 0.5)):
+                continue
+            # Drain everything buffered on the channel before checking the prompt
+            while self.shell.recv_ready():
+                buf.extend(self.shell.recv(RECV_CHUNK_SIZE))
+            if self.shell.eof_received:
+                break  # Channel closed
+            last_data = time.monotonic()
+            if prompt_re.search(buf[-128:]):
+                break
+        
+        return buf.decode('utf-8', errors='replace')
+    
+    def _drain(self, quiet=0.2):
+        """Discard output still arriving, until the channel is quiet for `quiet` seconds"""
+        buf = bytearray()
+        while self._selector.select(timeout=quiet):
+            while self.shell.recv_ready():
+                buf.extend(self.shell.recv(RECV_CHUNK_SIZE))
+            if self.shell.eof_received:
+                break
+        return buf.decode('utf-8', errors='replace')
+    
+    def reset(self):
+        """
+        Bring the shell back to a clean exec prompt before it is reused.
+        Leaves configuration mode, discards late output from the previous
+        command and checks the prompt. Returns False if the shell cannot be
+        trusted for another caller.
+        """
+        if not self.poolable or not self.is_alive():
+            return False
+        try:
+            self._drain()
+            self.shell.send('end\n')
+            output = self._read_until(PROMPT_REGEX, timeout=5) + self._drain()
+        except Exception as e:
+            logger.debug(f"Could not reset shell on {self.hostname}: {e}")
+            return False
+        lines = output.strip().splitlines()
+        prompt = lines[-1].strip() if lines else ''
+        if self.enable_password:
+            return bool(re.search(ENABLE_PROMPT_REGEX, prompt))
+        return bool(re.search(PROMPT_REGEX, prompt)) and '(' not in prompt
+    
+    def execute_command(self, command, prompt_regex=PROMPT_REGEX, timeout=None):
         """Execute a command on the device and return the output"""
         if not self.connected:
             return False, "Not connected to device"
         
         try:
-            # Send command
+            # Send command and read until the device prompt comes back
             self.shell.send(command + '\n')
-            time.sleep(wait_time)
-            
-            # Get output
-            output = ""
-            while self.shell.recv_ready():
-                chunk = self.shell.recv(4096).decode('utf-8')
-                output += chunk
-                time.sleep(0.1)
+            output = self._read_until(prompt_regex, timeout)
             
             return True, output
             
@@ -76,119 +252,340 @@ class SSHConnection:
             logger.error(f"Command execution failed on {self.hostname}: {e}")
             return False, str(e)
     
+    def exec_one(self, command, timeout=None):
+        """Run a single command on its own exec channel, returning (success, output)"""
+        if not self.connected:
+            return False, "Not connected to device"
+        
+        timeout = self.timeout if timeout is None else timeout
+        stdin, stdout, stderr = self.client.exec_command(command, timeout=timeout)
+        output = stdout.read().decode('utf-8', 'replace')
+        # Many network OSes never send an exit status (-1); treat that as success
+        exit_status = stdout.channel.recv_exit_status()
+        return exit_status in (0, -1), output
+    
     def enable_privilege_mode(self):
         """Enter enable/privilege mode if password is provided"""
         if not self.enable_password:
             return True
         
         try:
-            # Send enable command
+            # Send enable command and wait for the password prompt
             self.shell.send('enable\n')
-            time.sleep(1)
+            self._read_until(PASSWORD_PROMPT_REGEX)
             
-            # Send enable password
+            # Send enable password and wait for the enable prompt
             self.shell.send(self.enable_password + '\n')
-            time.sleep(1)
-            
-            # Check if we're in enable mode
-            output = ""
-            while self.shell.recv_ready():
-                chunk = self.shell.recv(4096).decode('utf-8')
-                output += chunk
+            output = self._read_until(PROMPT_REGEX)
             
+            lines = output.strip().splitlines()
+            if not lines or not re.search(ENABLE_PROMPT_REGEX, lines[-1].strip()):
+                logger.error(f"Enable password rejected on {self.hostname}")
+                return False
             return True
             
         except Exception as e:
             logger.error(f"Failed to enter enable mode on {self.hostname}: {e}")
             return False
     
+    def is_alive(self):
+        """Cheap liveness probe used before reusing a pooled connection"""
+        if not self.connected or not self.client or not self.shell:
+            return False
+        transport = self.client.get_transport()
+        if transport is None or not transport.is_active() or self.shell.closed:
+            return False
+        try:
+            transport.send_ignore()
+            return True
+        except Exception:
+            return False
+    
     def disconnect(self):
         """Close the SSH connection"""
+        if self._selector:
+            self._selector.close()
+            self._selector = None
         if self.client:
             self.client.close()
             self.connected = False
             logger.info(f"Disconnected from {self.hostname}")
 
 
-def execute_command_on_device(device, command):
-    """Execute a command on a network device using TACACS credentials"""
-    # Get TACACS credentials from environment variables
-    tacacs_username = os.getenv('TACACS_USERNAME')
-    tacacs_password = os.getenv('TACACS_PASSWORD')
-    tacacs_enable_password = os.getenv('TACACS_ENABLE_PASSWORD')
+class SSHConnectionPool:
+    """Thread-safe pool of authenticated SSH connections keyed by (host, port, user)"""
+    
+    def __init__(self, idle_timeout=300, max_age=3600, max_size=20):
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._idle = {}
+    
+    def _is_expired(self, conn, now):
+        return (now - conn.last_used > self.idle_timeout or
+                now - conn.created_at > self.max_age)
     
-    if not tacacs_username or not tacacs_password:
+    def _evict_expired(self, now):
+        """Remove expired idle connections; caller must hold the lock"""
+        expired = []
+        for key in list(self._idle):
+            idle = self._idle[key]
+            fresh = deque()
+            for conn in idle:
+                (expired if self._is_expired(conn, now) else fresh).append(conn)
+            if fresh:
+                self._idle[key] = fresh
+            else:
+                del self._idle[key]
+        return expired
+    
+    def borrow(self, hostname, username, password, port=22, timeout=30, enable_password=None):
+        """Return a live connection from the pool, or open a new one (None on failure)"""
+        key = (hostname, port, username)
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                conn = idle.pop() if idle else None
+            if conn is None:
+                break
+            if not self._is_expired(conn, time.monotonic()) and conn.is_alive():
+                return conn
+            conn.disconnect()
+        
+        conn = SSHConnection(
+            hostname=hostname,
+            username=username,
+            password=password,
+            port=port,
+            timeout=timeout,
+            enable_password=enable_password
+        )
+        if not conn.connect():
+            return None
+        if not conn.enable_privilege_mode():
+            # Still usable for this caller at the login privilege level,
+            # but never handed to anyone else
+            conn.poolable = False
+        return conn
+    
+    def return_(self, conn):
+        """Hand a connection back to the pool for reuse, or close it if its shell is not clean"""
+        if not conn.connected:
+            return
+        if not conn.reset():
+            conn.disconnect()
+            return
+        now = time.monotonic()
+        conn.last_used = now
+        key = (conn.hostname, conn.port, conn.username)
+        with self._lock:
+            to_close = self._evict_expired(now)
+            size = sum(len(idle) for idle in self._idle.values())
+            if size < self.max_size:
+                self._idle.setdefault(key, deque()).append(conn)
+            else:
+                to_close.append(conn)
+        for stale in to_close:
+            stale.disconnect()
+    
+    def close_all(self):
+        """Disconnect every idle connection (called on worker shutdown)"""
+        with self._lock:
+            conns = [conn for idle in self._idle.values() for conn in idle]
+            self._idle.clear()
+        for conn in conns:
+            conn.disconnect()
+
+
+@dataclass(frozen=True)
+class _TacacsCreds:
+    """TACACS credentials read once from the environment"""
+    username: str
+    password: str
+    enable_password: str
+    
+    @property
+    def configured(self):
+        return bool(self.username and self.password)
+
+
+def _load_tacacs():
+    """Read TACACS credentials from environment variables"""
+    return _TacacsCreds(
+        username=os.getenv('TACACS_USERNAME'),
+        password=os.getenv('TACACS_PASSWORD'),
+        enable_password=os.getenv('TACACS_ENABLE_PASSWORD')
+    )
+
+
+_TACACS = _load_tacacs()
+
+
+def reload_tacacs_credentials():
+    """Re-read TACACS credentials after the environment has changed"""
+    global _TACACS
+    _TACACS = _load_tacacs()
+    return _TACACS.configured
+
+
+def tacacs_configured():
+    """Whether TACACS username and password are available"""
+    return _TACACS.configured
+
+
+ssh_pool = SSHConnectionPool(
+    idle_timeout=getattr(settings, 'SSH_POOL_IDLE_TIMEOUT', 300),
+    max_age=getattr(settings, 'SSH_POOL_MAX_AGE', 3600),
+    max_size=getattr(settings, 'SSH_POOL_MAX_SIZE', 20)
+)
+
+
+@contextmanager
+def device_session(device):
+    """Borrow one pooled connection to a device for a batch of commands (yields None on failure)"""
+    creds = _TACACS
+    if not creds.configured:
         logger.error("TACACS credentials not configured in environment variables")
-        return False, "TACACS credentials not configured"
+        yield None
+        return
     
-    ssh = SSHConnection(
+    # Borrow an authenticated shell (already in enable mode) from the pool
+    ssh = ssh_pool.borrow(
         hostname=device.ip_address,
-        username=tacacs_username,
-        password=tacacs_password,
+        username=creds.username,
+        password=creds.password,
         port=device.ssh_port,
         timeout=settings.SSH_TIMEOUT,
-        enable_password=tacacs_enable_password
+        enable_password=creds.enable_password
     )
+    try:
+        yield ssh
+    except Exception:
+        if ssh is not None:
+            ssh.disconnect()
+        raise
+    finally:
+        if ssh is not None:
+            ssh_pool.return_(ssh)
+
+
+def _use_exec_channel(ssh, command):
+    """Whether a command can skip the interactive shell and use exec_command"""
+    if not getattr(settings, 'SSH_USE_EXEC_CHANNEL', False):
+        return False
+    # Exec channels run at the login privilege level, so only use them
+    # when the session does not rely on enable mode
+    if ssh.enable_password:
+        return False
+    return command.strip().lower().startswith(EXEC_COMMAND_PREFIXES)
+
+
+def execute_command_on_session(ssh, device, command):
+    """Execute a command on a connection obtained from device_session"""
+    if ssh is None:
+        return False, "Failed to connect to device"
     
     try:
-        if ssh.connect():
-            # Enter enable mode if password is provided
-            if device.enable_password:
-                ssh.enable_privilege_mode()
-            
-            # Execute command
+        if _use_exec_channel(ssh, command):
+            try:
+                success, output = ssh.exec_one(command)
+            except SSHException as e:
+                # Device refused an exec channel; fall back to the shell
+                logger.debug(f"Exec channel unavailable on {device.name}, using shell: {e}")
+                success, output = ssh.execute_command(command)
+        else:
             success, output = ssh.execute_command(command)
-            
-            if success:
-                logger.info(f"Command executed successfully on {device.name}: {command}")
-            else:
-                logger.error(f"Command failed on {device.name}: {output}")
-            
-            return success, output
+        
+        if success:
+            logger.info(f"Command executed successfully on {device.name}: {command}")
         else:
-            return False, "Failed to connect to device"
+            logger.error(f"Command failed on {device.name}: {output}")
+        
+        return success, output
             
     except Exception as e:
         logger.error(f"Error executing command on {device.name}: {e}")
-        return False, str(e)
-    finally:
         ssh.disconnect()
+        return False, str(e)
+
+
+def execute_command_on_device(device, command):
+    """Execute a command on a network device using TACACS credentials"""
+    with device_session(device) as ssh:
+        return execute_command_on_session(ssh, device, command)
+
+
+def execute_commands_on_device(device, commands):
+    """Execute several commands over a single SSH session, returning [(success, output), ...]"""
+    with device_session(device) as ssh:
+        return [execute_command_on_session(ssh, device, command) for command in commands]
+
+
+@lru_cache(maxsize=4096)
+def _compile(pattern):
+    """Compile a validation pattern once and reuse it across executions"""
+    if re2 is not None:
+        try:
+            return re2.compile('(?ms)' + pattern)
+        except re2.error:
+            # Backreferences/lookarounds are not supported by RE2
+            logger.debug(f"Pattern not supported by re2, falling back to re: {pattern}")
+    return re.compile(pattern, re.MULTILINE | re.DOTALL)
+
+
+def _op_contains(compiled, output):
+    """Pass if the pattern is found anywhere in the output"""
+    match = compiled.search(output)
+    return bool(match), match.group() if match else ""
+
+
+def _op_equal(compiled, output):
+    """Pass if the entire output matches the pattern"""
+    full_match = compiled.fullmatch(output)
+    return bool(full_match), full_match.group() if full_match else ""
+
+
+def _op_not_equal(compiled, output):
+    """Pass if the output does NOT fully match the pattern"""
+    full_match = compiled.fullmatch(output)
+    return not bool(full_match), "Output does not match pattern" if not full_match else "Output matches pattern (validation failed)"
+
+
+def _op_not_contains(compiled, output):
+    """Pass if the pattern is NOT found in the output"""
+    match = compiled.search(output)
+    return not bool(match), "Pattern not found (validation passed)" if not match else "Pattern found (validation failed)"
+
+
+_OPS = {
+    'contains': _op_contains,
+    'equal': _op_equal,
+    'not_equal': _op_not_equal,
+    'not_contains': _op_not_contains,
+}
 
 
 def validate_output(output, validation_rule):
     """Validate command output using regex with comparison operators"""
-    try:
-        import re
-
-        if 'regex' in validation_rule:
-            pattern = validation_rule['regex']
-            match = re.search(pattern, output, re.MULTILINE | re.DOTALL)
+    if not validation_rule:
+        return True, "No validation rules provided"
 
+    try:
+        pattern = validation_rule.get('regex')
+        if pattern is not None:
             # Get comparison operator (default to 'contains' if not specified)
             operator = validation_rule.get('operator', 'contains').lower()
-
-            if operator == 'contains':
-                # Default behavior: check if pattern is found in output
-                return bool(match), match.group() if match else ""
-            elif operator == 'equal':
-                # Check if the entire output exactly matches the pattern
-                full_match = re.fullmatch(pattern, output, re.MULTILINE | re.DOTALL)
-                return bool(full_match), full_match.group() if full_match else ""
-            elif operator == 'not_equal':
-                # Check if the output does NOT match the pattern
-                full_match = re.fullmatch(pattern, output, re.MULTILINE | re.DOTALL)
-                return not bool(full_match), "Output does not match pattern" if not full_match else "Output matches pattern (validation failed)"
-            elif operator == 'not_contains':
-                # Check if the pattern is NOT found in output
-                return not bool(match), "Pattern not found (validation passed)" if not match else "Pattern found (validation failed)"
-            else:
+            op = _OPS.get(operator)
+            if op is None:
                 # Unknown operator, fall back to default contains behavior
                 logger.warning(f"Unknown validation operator '{operator}', using 'contains'")
-                return bool(match), match.group() if match else ""
+                op = _op_contains
+            return op(_compile(pattern), output)
 
         # Add AI validation here if API key is provided
         # This is a placeholder for AI validation
-        if 'ai_validation' in validation_rule and hasattr(settings, 'AI_API_KEY') and settings.AI_API_KEY:
+        if 'ai_validation' in validation_rule and getattr(settings, 'AI_API_KEY', None):
             # AI validation logic would go here
             return True, "AI validation passed"
 
@@ -197,4 +594,4 @@ def validate_output(output, validation_rule):
 
     except Exception as e:
         logger.error(f"Validation error: {e}")
-        return False, str(e)
\ No newline at end of file
+        return False, str(e)
@@ -1,15 +1,43 @@
 from celery import shared_task
+from celery.signals import worker_init, worker_shutdown
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
 from django.contrib.auth.models import User
 import logging
 import time
 import re
 from .models import WorkflowExecution, CommandExecution, WorkflowVariable, WebhookConfiguration
-from .ssh_utils import execute_command_on_device, validate_output
+from .ssh_utils import (
+    execute_command_on_device, execute_command_on_session, device_session,
+    validate_output, ssh_pool, tacacs_configured
+)
 from .webhook_utils import WebhookManager
 
 logger = logging.getLogger(__name__)
 
+# {{param}} placeholders in dynamic validation patterns
+_PLACEHOLDER_RE = re.compile(r'\{\{(.+?)\}\}')
+
+
+@worker_init.connect
+def check_tacacs_credentials(**kwargs):
+    """Warn at worker start if SSH workflow tasks will be unable to log in"""
+    if not tacacs_configured():
+        # Ansible, webhook and cleanup tasks don't need TACACS, so the worker
+        # still starts; SSH workflow commands fail with a connection error
+        logger.warning(
+            "TACACS_USERNAME and TACACS_PASSWORD are not set; SSH workflow "
+            "executions on this worker will fail"
+        )
+
+
+@worker_shutdown.connect
+def close_ssh_connection_pool(**kwargs):
+    """Close pooled SSH connections when the Celery worker shuts down"""
+    ssh_pool.close_all()
+
 
 def substitute_variables_in_command(command, workflow_execution):
     """Substitute variables in a command using {variable_name} syntax"""
@@ -88,100 +116,155 @@ def extract_and_store_variables(command_data, output, workflow_execution, stage_
 @shared_task(bind=True)
 def execute_workflow(self, workflow_execution_id):
     """Execute a workflow with pre-check, implementation, post-check, and rollback"""
+    return run_workflow_execution(
+        workflow_execution_id,
+        report_progress=lambda meta: self.update_state(state='PROGRESS', meta=meta)
+    )
+
+
+@shared_task
+def execute_workflows_batch(workflow_execution_ids, max_concurrent_devices=None):
+    """Execute several workflow executions concurrently on one worker"""
+    if max_concurrent_devices is None:
+        max_concurrent_devices = settings.WORKFLOW_BATCH_MAX_CONCURRENT_DEVICES
+    
+    def run_one(workflow_execution_id):
+        try:
+            return run_workflow_execution(workflow_execution_id)
+        finally:
+            # Each worker thread gets its own DB connection; don't leak it
+            connection.close()
+    
+    # SSH I/O is blocking and releases the GIL, so threads overlap the
+    # network waits of different devices. The pool size bounds concurrent
+    # SSH logins to respect the devices' sshd MaxStartups.
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrent_devices)) as executor:
+        results = list(executor.map(run_one, workflow_execution_ids))
+    
+    return dict(zip(workflow_execution_ids, results))
+
+
+def _rollback_session(ssh):
+    """
+    The execution's shared session if it still works, else None so the
+    rollback stage logs in again. A failed stage often means the connection
+    dropped, and rollback must not run against a dead shell.
+    """
+    if ssh is not None and ssh.is_alive():
+        return ssh
+    logger.warning("SSH session lost before rollback; reconnecting")
+    return None
+
+
+def run_workflow_execution(workflow_execution_id, report_progress=None):
+    """Run all stages of a workflow execution, reporting stage progress if a callback is given"""
+    if report_progress is None:
+        report_progress = lambda meta: None
+    
     try:
-        workflow_execution = WorkflowExecution.objects.get(id=workflow_execution_id)
+        workflow_execution = WorkflowExecution.objects.select_related(
+            'workflow', 'device'
+        ).get(id=workflow_execution_id)
         workflow = workflow_execution.workflow
         device = workflow_execution.device
         
+        # Commands are JSON text on the workflow row; parse each list once
+        pre_check_commands = workflow.get_pre_check_commands()
+        implementation_commands = workflow.get_implementation_commands()
+        post_check_commands = workflow.get_post_check_commands()
+        rollback_commands = workflow.get_rollback_commands()
+        
         logger.info(f"Starting workflow execution: {workflow.name} on {device.name}")
         
         # Update status to running
         workflow_execution.status = 'running'
         workflow_execution.started_at = timezone.now()
-        workflow_execution.save()
+        workflow_execution.save(update_fields=['status', 'started_at'])
 
         # Send webhook notification for execution started
         WebhookManager.send_webhook_notification(workflow_execution, 'execution_started')
         
-        # Execute pre-check stage
-        self.update_state(state='PROGRESS', meta={'stage': 'Pre-Check', 'progress': 10})
-        pre_check_passed = execute_workflow_stage(
-            workflow_execution, 'pre_check', workflow.get_pre_check_commands()
-        )
+        # Keep one SSH session open across all stages of this execution
+        with device_session(device) as ssh:
+            # Execute pre-check stage
+            report_progress({'stage': 'Pre-Check', 'progress': 10})
+            pre_check_passed = execute_workflow_stage(
+                workflow_execution, 'pre_check', pre_check_commands, ssh=ssh
+            )
         
-        if not pre_check_passed:
-            # Pre-check failed, don't proceed
-            workflow_execution.status = 'failed'
-            workflow_execution.current_stage = 'pre_check'
-            workflow_execution.error_message = "Pre-check validation failed"
-            workflow_execution.completed_at = timezone.now()
-            workflow_execution.save()
-            logger.error(f"Pre-check failed for workflow {workflow.name}")
+            if not pre_check_passed:
+                # Pre-check failed, don't proceed
+                workflow_execution.status = 'failed'
+                workflow_execution.current_stage = 'pre_check'
+                workflow_execution.error_message = "Pre-check validation failed"
+                workflow_execution.completed_at = timezone.now()
+                workflow_execution.save(update_fields=['status', 'current_stage', 'error_message', 'completed_at'])
+                logger.error(f"Pre-check failed for workflow {workflow.name}")
     
-            # Send webhook notification for failed execution
-            WebhookManager.send_webhook_notification(workflow_execution, 'execution_failed')
+                # Send webhook notification for failed execution
+                WebhookManager.send_webhook_notification(workflow_execution, 'execution_failed')
     
-            return {'status': 'failed', 'stage': 'pre_check', 'error': 'Pre-check validation failed'}
+                return {'status': 'failed', 'stage': 'pre_check', 'error': 'Pre-check validation failed'}
         
-        # Execute implementation stage
-        self.update_state(state='PROGRESS', meta={'stage': 'Implementation', 'progress': 50})
-        implementation_success = execute_workflow_stage(
-            workflow_execution, 'implementation', workflow.get_implementation_commands()
-        )
+            # Execute implementation stage
+            report_progress({'stage': 'Implementation', 'progress': 50})
+            implementation_success = execute_workflow_stage(
+                workflow_execution, 'implementation', implementation_commands, ssh=ssh
+            )
         
-        if not implementation_success:
-            # Implementation failed, rollback
-            self.update_state(state='PROGRESS', meta={'stage': 'Rollback', 'progress': 80})
-            workflow_execution.status = 'rolling_back'
-            workflow_execution.current_stage = 'rollback'
-            workflow_execution.save()
+            if not implementation_success:
+                # Implementation failed, rollback
+                report_progress({'stage': 'Rollback', 'progress': 80})
+                workflow_execution.status = 'rolling_back'
+                workflow_execution.current_stage = 'rollback'
+                workflow_execution.save(update_fields=['status', 'current_stage'])
             
-            execute_workflow_stage(
-                workflow_execution, 'rollback', workflow.get_rollback_commands()
-            )
+                execute_workflow_stage(
+                    workflow_execution, 'rollback', rollback_commands, ssh=_rollback_session(ssh)
+                )
             
-            workflow_execution.status = 'rolled_back'
-            workflow_execution.completed_at = timezone.now()
-            workflow_execution.save()
-            logger.error(f"Implementation failed, rolled back workflow {workflow.name}")
+                workflow_execution.status = 'rolled_back'
+                workflow_execution.completed_at = timezone.now()
+                workflow_execution.save(update_fields=['status', 'completed_at'])
+                logger.error(f"Implementation failed, rolled back workflow {workflow.name}")
 
-            # Send webhook notification for failed execution
-            WebhookManager.send_webhook_notification(workflow_execution, 'execution_failed')
+                # Send webhook notification for failed execution
+                WebhookManager.send_webhook_notification(workflow_execution, 'execution_failed')
 
-            return {'status': 'rolled_back', 'stage': 'rollback', 'error': 'Implementation failed and rolled back'}
+                return {'status': 'rolled_back', 'stage': 'rollback', 'error': 'Implementation failed and rolled back'}
         
-        # Execute post-check stage
-        self.update_state(state='PROGRESS', meta={'stage': 'Post-Check', 'progress': 90})
-        post_check_passed = execute_workflow_stage(
-            workflow_execution, 'post_check', workflow.get_post_check_commands()
-        )
+            # Execute post-check stage
+            report_progress({'stage': 'Post-Check', 'progress': 90})
+            post_check_passed = execute_workflow_stage(
+                workflow_execution, 'post_check', post_check_commands, ssh=ssh
+            )
         
-        if not post_check_passed:
-            # Post-check failed, rollback
-            workflow_execution.status = 'rolling_back'
-            workflow_execution.current_stage = 'rollback'
-            workflow_execution.save()
+            if not post_check_passed:
+                # Post-check failed, rollback
+                workflow_execution.status = 'rolling_back'
+                workflow_execution.current_stage = 'rollback'
+                workflow_execution.save(update_fields=['status', 'current_stage'])
             
-            execute_workflow_stage(
-                workflow_execution, 'rollback', workflow.get_rollback_commands()
-            )
+                execute_workflow_stage(
+                    workflow_execution, 'rollback', rollback_commands, ssh=_rollback_session(ssh)
+                )
             
-            workflow_execution.status = 'rolled_back'
-            workflow_execution.error_message = "Post-check validation failed"
-            workflow_execution.completed_at = timezone.now()
-            workflow_execution.save()
-            logger.error(f"Post-check failed, rolled back workflow {workflow.name}")
+                workflow_execution.status = 'rolled_back'
+                workflow_execution.error_message = "Post-check validation failed"
+                workflow_execution.completed_at = timezone.now()
+                workflow_execution.save(update_fields=['status', 'error_message', 'completed_at'])
+                logger.error(f"Post-check failed, rolled back workflow {workflow.name}")
 
-            # Send webhook notification for failed execution
-            WebhookManager.send_webhook_notification(workflow_execution, 'execution_failed')
+                # Send webhook notification for failed execution
+                WebhookManager.send_webhook_notification(workflow_execution, 'execution_failed')
 
-            return {'status': 'rolled_back', 'stage': 'rollback', 'error': 'Post-check validation failed'}
+                return {'status': 'rolled_back', 'stage': 'rollback', 'error': 'Post-check validation failed'}
         
         # Workflow completed successfully
         workflow_execution.status = 'completed'
         workflow_execution.current_stage = 'completed'
         workflow_execution.completed_at = timezone.now()
-        workflow_execution.save()
+        workflow_execution.save(update_fields=['status', 'current_stage', 'completed_at'])
 
         logger.info(f"Workflow completed successfully: {workflow.name}")
 
@@ -200,7 +283,7 @@ def execute_workflow(self, workflow_execution_id):
             workflow_execution.status = 'failed'
             workflow_execution.error_message = str(e)
             workflow_execution.completed_at = timezone.now()
-            workflow_execution.save()
+            workflow_execution.save(update_fields=['status', 'error_message', 'completed_at'])
         except:
             pass
         return {'status': 'error', 'error': str(e)}
@@ -262,8 +345,9 @@ def evaluate_condition(condition, output, exit_code, workflow_execution):
         return False
 
 
-def execute_conditional_commands(workflow_execution, stage_name, commands, workflow_execution_obj):
-    """Execute a list of conditional commands"""
+def execute_conditional_commands(workflow_execution, stage_name, commands, workflow_execution_obj, command_records,
+                                 ssh=None):
+    """Execute a list of conditional commands, buffering their records in the stage's command_records"""
     results = []
 
     for command_data in commands:
@@ -279,35 +363,38 @@ def execute_conditional_commands(workflow_execution, stage_name, commands, workf
             # Substitute variables in the command
             final_command = substitute_variables_in_command(original_command, workflow_execution_obj)
 
-            # Create command execution record
-            cmd_exec = CommandExecution.objects.create(
+            # Buffer command execution record; written in bulk at stage end
+            cmd_exec = CommandExecution(
                 workflow_execution=workflow_execution_obj,
                 command=original_command,
                 stage=stage_name,
                 status='running',
                 started_at=timezone.now()
             )
+            command_records.append(cmd_exec)
 
             # Execute command
-            success, output = execute_command_on_device(workflow_execution.device, final_command)
+            if ssh is not None:
+                success, output = execute_command_on_session(ssh, workflow_execution.device, final_command)
+            else:
+                success, output = execute_command_on_device(workflow_execution.device, final_command)
 
             cmd_exec.status = 'completed' if success else 'failed'
             cmd_exec.output = output
             cmd_exec.completed_at = timezone.now()
-            cmd_exec.save()
 
-            results.append({
+            # Extract and store variables from command output
+            if success and isinstance(command_data, dict):
+                extract_and_store_variables(command_data, output, workflow_execution_obj, stage_name, cmd_exec)
+
+            result = {
                 'command': original_command,
                 'final_command': final_command,
                 'success': success,
                 'output': output,
                 'validation_passed': True,
                 'regex_pattern': regex_pattern
-            })
-
-            # Extract and store variables from command output
-            if success and isinstance(command_data, dict):
-                extract_and_store_variables(command_data, output, workflow_execution_obj, stage_name, cmd_exec)
+            }
 
             # Validate output if regex pattern exists
             if regex_pattern and success:
@@ -315,21 +402,24 @@ def execute_conditional_commands(workflow_execution, stage_name, commands, workf
                 if isinstance(command_data, dict) and 'operator' in command_data:
                     validation_rule['operator'] = command_data['operator']
                 validation_passed, validation_result = validate_output(output, validation_rule)
-                results[-1]['validation_passed'] = validation_passed
-                results[-1]['validation_result'] = validation_result
+                result['validation_passed'] = validation_passed
+                result['validation_result'] = validation_result
                 cmd_exec.validation_result = validation_result
-                cmd_exec.save()
+
+            results.append(result)
 
         except Exception as e:
             logger.error(f"Error executing conditional command in {stage_name}: {e}")
-            CommandExecution.objects.create(
+            now = timezone.now()
+            command_records.append(CommandExecution(
                 workflow_execution=workflow_execution_obj,
                 command=str(command_data),
                 stage=stage_name,
                 status='failed',
                 error_output=str(e),
-                completed_at=timezone.now()
-            )
+                started_at=now,
+                completed_at=now
+            ))
             results.append({
                 'command': str(command_data),
                 'success': False,
@@ -339,11 +429,40 @@ def execute_conditional_commands(workflow_execution, stage_name, commands, workf
     return results
 
 
-def execute_workflow_stage(workflow_execution, stage_name, commands):
+def _flush_command_executions(command_records):
+    """
+    Write buffered CommandExecution rows in a single batched INSERT.
+    Errors propagate so a lost audit trail fails the execution.
+    """
+    if command_records:
+        for record in command_records:
+            record.set_level()
+        with transaction.atomic():
+            CommandExecution.objects.bulk_create(command_records, batch_size=200)
+        command_records.clear()
+
+
+def execute_workflow_stage(workflow_execution, stage_name, commands, ssh=None):
     """Execute a stage of the workflow (pre-check, implementation, post-check, rollback)"""
-    workflow = workflow_execution.workflow
+    command_records = []
+    try:
+        if ssh is not None:
+            # Reuse the caller's session instead of logging in again
+            return _execute_stage_commands(workflow_execution, stage_name, commands, ssh, command_records)
+        # All commands in the stage share one authenticated SSH session
+        with device_session(workflow_execution.device) as ssh:
+            return _execute_stage_commands(workflow_execution, stage_name, commands, ssh, command_records)
+    finally:
+        # Written on this thread, after the stage, in one transaction
+        _flush_command_executions(command_records)
+
+
+def _execute_stage_commands(workflow_execution, stage_name, commands, ssh, command_records):
+    """Run a stage's commands on an open SSH session and store the stage results"""
     device = workflow_execution.device
     results = []
+    # Dynamic params are fixed for the execution; parse them once per stage
+    dynamic_params = workflow_execution.get_dynamic_params()
 
     for i, command_data in enumerate(commands):
         try:
@@ -360,35 +479,35 @@ def execute_workflow_stage(workflow_execution, stage_name, commands):
             # Substitute variables in the command
             final_command = substitute_variables_in_command(original_command, workflow_execution)
 
-            # Create command execution record
-            cmd_exec = CommandExecution.objects.create(
+            # Buffer command execution record; written in bulk at stage end
+            cmd_exec = CommandExecution(
                 workflow_execution=workflow_execution,
                 command=original_command,  # Store original command for reference
                 stage=stage_name,
                 status='running',
                 started_at=timezone.now()
             )
+            command_records.append(cmd_exec)
 
             # Execute command
-            success, output = execute_command_on_device(device, final_command)
+            success, output = execute_command_on_session(ssh, device, final_command)
 
             cmd_exec.status = 'completed' if success else 'failed'
             cmd_exec.output = output
             cmd_exec.completed_at = timezone.now()
-            cmd_exec.save()
 
-            results.append({
+            # Extract and store variables from command output
+            if success and isinstance(command_data, dict):
+                extract_and_store_variables(command_data, output, workflow_execution, stage_name, cmd_exec)
+
+            result = {
                 'command': original_command,
                 'final_command': final_command,  # Include the command after variable substitution
                 'success': success,
                 'output': output,
                 'validation_passed': True,
                 'regex_pattern': regex_pattern
-            })
-
-            # Extract and store variables from command output
-            if success and isinstance(command_data, dict):
-                extract_and_store_variables(command_data, output, workflow_execution, stage_name, cmd_exec)
+            }
 
             # Validate output if regex pattern exists
             if regex_pattern and success:
@@ -398,37 +517,32 @@ def execute_workflow_stage(workflow_execution, stage_name, commands):
                     validation_rule['operator'] = command_data['operator']
                 # Handle dynamic patterns if this is a dynamic command
                 if isinstance(command_data, dict) and command_data.get('is_dynamic', False):
-                    # Get dynamic params from workflow execution
-                    execution_dynamic_params = workflow_execution.get_dynamic_params()
-                    if execution_dynamic_params:
-                        # Replace dynamic parameters in the pattern
-                        dynamic_regex = regex_pattern
-                        for param_name, param_value in execution_dynamic_params.items():
-                            placeholder = f"{{{{{param_name}}}}}"
-                            if placeholder in dynamic_regex:
-                                dynamic_regex = dynamic_regex.replace(placeholder, param_value)
-                        validation_rule['regex'] = dynamic_regex
+                    if dynamic_params:
+                        # Replace {{param}} placeholders in one pass over the pattern
+                        validation_rule['regex'] = _PLACEHOLDER_RE.sub(
+                            lambda m: str(dynamic_params.get(m.group(1), m.group(0))),
+                            regex_pattern
+                        )
                 validation_passed, validation_result = validate_output(output, validation_rule)
-                results[-1]['validation_passed'] = validation_passed
-                results[-1]['validation_result'] = validation_result
 
                 # Update command execution with validation results
                 cmd_exec.validation_result = validation_result
-                cmd_exec.save()
 
                 # If validation failed, handle based on stage
                 if not validation_passed:
-                    logger.warning(f"Validation failed for {stage_name}: {original_command}")
-                    logger.warning(f"Regex pattern: {regex_pattern}")
-                    logger.warning(f"Output: {output}")
+                    logger.warning(f"Validation failed for {stage_name}: {original_command} (regex pattern: {regex_pattern})")
+                    logger.debug(f"Output: {output}")
 
-                    if stage_name == 'pre_check':
-                        # Pre-check validation failed - cancel workflow
-                        return False
-                    elif stage_name in ['implementation', 'post_check']:
-                        # Implementation/Post-check validation failed - will trigger rollback
+                    # Pre-check failure cancels the workflow; implementation/post-check
+                    # failure triggers rollback. Stage results are not stored either way.
+                    if stage_name in ('pre_check', 'implementation', 'post_check'):
                         return False
 
+                result['validation_passed'] = validation_passed
+                result['validation_result'] = validation_result
+
+            results.append(result)
+
             # Handle conditional logic
             if condition and isinstance(command_data, dict):
                 # Determine exit code (0 for success, 1 for failure)
@@ -441,27 +555,31 @@ def execute_workflow_stage(workflow_execution, stage_name, commands):
                 if condition_met and condition.get('then'):
                     logger.info(f"Condition met for command '{original_command}', executing 'then' branch")
                     then_results = execute_conditional_commands(
-                        workflow_execution, f"{stage_name}_conditional", condition['then'], workflow_execution
+                        workflow_execution, f"{stage_name}_conditional", condition['then'], workflow_execution,
+                        command_records, ssh=ssh
                     )
                     results.extend(then_results)
                 elif not condition_met and condition.get('else'):
                     logger.info(f"Condition not met for command '{original_command}', executing 'else' branch")
                     else_results = execute_conditional_commands(
-                        workflow_execution, f"{stage_name}_conditional", condition['else'], workflow_execution
+                        workflow_execution, f"{stage_name}_conditional", condition['else'], workflow_execution,
+                        command_records, ssh=ssh
                     )
                     results.extend(else_results)
 
         except Exception as e:
             logger.error(f"Error executing command in {stage_name}: {e}")
-            # Create failed command execution record
-            CommandExecution.objects.create(
+            now = timezone.now()
+            # Buffer failed command execution record
+            command_records.append(CommandExecution(
                 workflow_execution=workflow_execution,
                 command=str(command_data),
                 stage=stage_name,
                 status='failed',
                 error_output=str(e),
-                completed_at=timezone.now()
-            )
+                started_at=now,
+                completed_at=now
+            ))
             results.append({
                 'command': str(command_data),
                 'success': False,
@@ -483,14 +601,15 @@ def execute_workflow_stage(workflow_execution, stage_name, commands):
     elif stage_name == 'rollback':
         workflow_execution.set_rollback_results(stage_results)
 
-    workflow_execution.save()
+    if stage_name in ('pre_check', 'implementation', 'post_check', 'rollback'):
+        workflow_execution.save(update_fields=[f'{stage_name}_results'])
 
     # Return True if all commands in this stage succeeded and passed validation
     return all(result.get('success', False) and result.get('validation_passed', True) for result in results)
 
 
 @shared_task
-def cleanup_old_executions():
+def cleanup_old_executions(batch_size=1000, pause=0.1):
     """Clean up old workflow executions (older than 30 days)"""
     from datetime import timedelta
     cutoff_date = timezone.now() - timedelta(days=30)
@@ -500,13 +619,30 @@ def cleanup_old_executions():
         status__in=['completed', 'failed', 'cancelled', 'rolled_back']
     )
     
-    deleted_count = old_executions.count()
-    old_executions.delete()
+    # Delete in small batches so each transaction (and its row locks)
+    # stays short while workflows are running
+    deleted_count = 0
+    while True:
+        batch = list(old_executions.values_list('id', flat=True)[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic():
+            WorkflowExecution.objects.filter(id__in=batch).delete()
+        deleted_count += len(batch)
+        if len(batch) < batch_size:
+            break
+        time.sleep(pause)
     
     logger.info(f"Cleaned up {deleted_count} old workflow executions")
     return f"Cleaned up {deleted_count} old executions"
 
 
+@shared_task
+def retry_webhook_delivery(config_id, body, event_type, attempt):
+    """Re-send a webhook whose delivery failed with a network error"""
+    return WebhookManager.redeliver(config_id, body, event_type, attempt)
+
+
 @shared_task
 def execute_ansible_playbook_on_device_task(
     device_id, playbook_content, variables=None, tags=None, skip_tags=None
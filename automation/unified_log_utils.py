@@ -1,22 +1,72 @@
 """
 Unified logging utilities that consolidate system logs, workflow logs, and Ansible logs
 """
+import base64
+import hashlib
 import json
 import logging
-from django.contrib.auth.models import AnonymousUser
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import (
+    CharField, DateTimeField, F, FloatField, IntegerField, Q, TextField, UUIDField, Value
+)
+from django.db.models.functions import Substr
 from .models import SystemLog, AnsibleExecution, WorkflowExecution, CommandExecution, Device
 from .log_utils import SystemLogger
 
 logger = logging.getLogger(__name__)
 
 
+RECENT_EXECUTIONS_CACHE_TIMEOUT = 30
+UNIFIED_LOG_COUNT_CACHE_TIMEOUT = 30
+
+# List entries carry only a preview of stdout/stderr; execution_logs has the full text
+LOG_PREVIEW_LENGTH = 500
+_RECENT_EXECUTIONS_GENERATION_KEY = 'unified:executions:generation'
+
+
+def _count_in_thread(queryset):
+    """Count a queryset on a worker thread's own DB connection"""
+    connection.close_if_unusable_or_obsolete()
+    try:
+        return queryset.count()
+    finally:
+        connection.close()
+
+
+def recent_executions_cache_key(limit):
+    """Cache key for the recent-executions list, scoped to the current generation"""
+    generation = cache.get_or_set(_RECENT_EXECUTIONS_GENERATION_KEY, 0, None)
+    return f"unified:executions:{generation}:{limit}"
+
+
+def invalidate_recent_executions_cache():
+    """Orphan every cached recent-executions list by bumping the generation"""
+    try:
+        cache.incr(_RECENT_EXECUTIONS_GENERATION_KEY)
+    except ValueError:
+        cache.set(_RECENT_EXECUTIONS_GENERATION_KEY, 1, None)
+
+
 class UnifiedLogEntry:
     """Unified log entry that can represent different types of logs"""
     
+    # Pages can hold thousands of entries; slots avoid a __dict__ per entry
+    __slots__ = (
+        'id', 'log_type', 'level', 'message', 'timestamp', 'details', 'user',
+        'device_name', 'execution_id', 'execution_type', 'stdout', 'stderr',
+        'command', 'playbook_name', 'workflow_name', 'host_results',
+    )
+    
     def __init__(self, log_type, level, message, timestamp, details=None, 
                  user=None, device_name=None, execution_id=None, execution_type=None,
                  stdout=None, stderr=None, command=None, playbook_name=None,
-                 workflow_name=None, host_results=None, **kwargs):
+                 workflow_name=None, host_results=None, id=None):
+        self.id = id
         self.log_type = log_type  # 'system', 'workflow', 'ansible', 'command'
         self.level = level
         self.message = message
@@ -32,12 +82,90 @@ class UnifiedLogEntry:
         self.playbook_name = playbook_name
         self.workflow_name = workflow_name
         self.host_results = host_results or []
-        self.raw_data = kwargs
+    
+    @classmethod
+    def from_row(cls, row, usernames):
+        """Build an entry from a row of UnifiedLogCollector's unified projection"""
+        log_type = row['log_type']
+        user = usernames.get(row['log_user_id'], 'System')
+        execution_id = str(row['log_execution_id']) if row['log_execution_id'] else None
+        
+        if log_type == 'system':
+            return cls(
+                log_type='system',
+                level=row['log_level'],
+                message=row['log_message'],
+                timestamp=row['log_timestamp'],
+                details={'details': row['log_details']} if row['log_details'] else {},
+                user=user,
+                id=row['log_id']
+            )
+        
+        if log_type == 'ansible':
+            return cls(
+                log_type='ansible',
+                level=row['log_level'],
+                message=f"Ansible Playbook: {row['log_name']} - Status: {row['log_status']}",
+                timestamp=row['log_timestamp'],
+                details={
+                    'execution_time': row['log_execution_time'],
+                    'return_code': row['log_return_code'],
+                    'started_at': row['log_started_at'],
+                    'completed_at': row['log_completed_at'],
+                },
+                user=user,
+                device_name=None,  # Ansible might target multiple devices
+                execution_id=execution_id,
+                execution_type='ansible',
+                stdout=row['log_stdout'],
+                stderr=row['log_stderr'],
+                playbook_name=row['log_name'],
+                id=row['log_id']
+            )
+        
+        if log_type == 'workflow':
+            return cls(
+                log_type='workflow',
+                level=row['log_level'],
+                message=f"Workflow: {row['log_name']} on {row['log_device_name']} - Status: {row['log_status']}",
+                timestamp=row['log_timestamp'],
+                details={
+                    'current_stage': row['log_stage'],
+                    'execution_time': row['log_execution_time'],
+                    'error_message': row['log_error_message'],
+                },
+                user=user,
+                device_name=row['log_device_name'],
+                execution_id=execution_id,
+                execution_type='workflow',
+                workflow_name=row['log_name'],
+                id=row['log_id']
+            )
+        
+        return cls(
+            log_type='command',
+            level=row['log_level'],
+            message=f"Command [{row['log_stage']}]: {row['log_command'][:100]}",
+            timestamp=row['log_timestamp'],
+            details={
+                'stage': row['log_stage'],
+                'exit_code': row['log_return_code'],
+                'execution_time': row['log_execution_time'],
+                'validation_result': row['log_validation_result'],
+            },
+            user=user,
+            device_name=row['log_device_name'],
+            execution_id=execution_id,
+            execution_type='command',
+            command=row['log_command'],
+            workflow_name=row['log_name'],
+            id=row['log_id']
+        )
     
     def to_dict(self):
         """Convert to dictionary for API serialization"""
         return {
-            'id': str(self.raw_data.get('id', '')),
+            'id': str(self.id) if self.id is not None else '',
             'log_type': self.log_type,
             'level': self.level,
             'message': self.message,
@@ -56,13 +184,86 @@ class UnifiedLogEntry:
         }
 
 
+# Columns shared by every per-source projection. union() requires each
+# SELECT to have the same columns in the same order with compatible types.
+UNIFIED_LOG_COLUMNS = (
+    ('log_id', UUIDField()),
+    ('log_type', CharField()),
+    ('log_level', CharField()),
+    ('log_timestamp', DateTimeField()),
+    ('log_message', TextField()),
+    ('log_status', CharField()),
+    ('log_user_id', IntegerField()),
+    ('log_device_name', CharField()),
+    ('log_execution_id', UUIDField()),
+    ('log_name', CharField()),
+    ('log_command', TextField()),
+    ('log_stage', CharField()),
+    ('log_stdout', TextField()),
+    ('log_stderr', TextField()),
+    ('log_details', TextField()),
+    ('log_return_code', IntegerField()),
+    ('log_execution_time', FloatField()),
+    ('log_started_at', DateTimeField()),
+    ('log_completed_at', DateTimeField()),
+    ('log_error_message', TextField()),
+    ('log_validation_result', TextField()),
+)
+
+
+def _project(queryset, log_type, **columns):
+    """Project a source queryset onto UNIFIED_LOG_COLUMNS, padding missing columns with NULL"""
+    columns['log_type'] = Value(log_type, output_field=CharField())
+    # Annotate in UNIFIED_LOG_COLUMNS order so every projection selects identically
+    annotations = {
+        name: columns.get(name, Value(None, output_field=field))
+        for name, field in UNIFIED_LOG_COLUMNS
+    }
+    return queryset.order_by().annotate(**annotations).values(*annotations)
+
+
+def _cursor_encode(timestamp, log_id, log_type):
+    """Opaque keyset cursor for the entry a page ended on"""
+    raw = f"{timestamp.isoformat()}|{log_id}|{log_type}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _cursor_decode(cursor):
+    """Inverse of _cursor_encode; raises ValueError for a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, log_id, log_type = raw.split('|')
+        return datetime.fromisoformat(timestamp), uuid.UUID(log_id), log_type
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def _after_cursor(queryset, log_type, cursor):
+    """
+    Restrict a projected source to entries after the cursor in
+    (timestamp, log_type, id) descending order. log_type is constant
+    per source, so its part of the comparison is resolved here.
+    """
+    cur_ts, cur_id, cur_type = cursor
+    if log_type < cur_type:
+        return queryset.filter(log_timestamp__lte=cur_ts)
+    if log_type > cur_type:
+        return queryset.filter(log_timestamp__lt=cur_ts)
+    return queryset.filter(
+        Q(log_timestamp__lt=cur_ts) | Q(log_timestamp=cur_ts, log_id__lt=cur_id)
+    )
+
+
 class UnifiedLogCollector:
     """Collects and unifies logs from different sources"""
     
     @staticmethod
-    def get_unified_logs(filters=None):
+    def get_unified_logs(filters=None, offset=0, limit=None, cursor=None):
         """
-        Get unified logs from all sources
+        Get one page of unified logs from all sources
+        
+        The sources are combined with UNION ALL so the database does the
+        merge-sort and LIMIT; only the requested rows are fetched.
         
         Args:
             filters: Dictionary with filtering options
@@ -73,34 +274,98 @@ class UnifiedLogCollector:
                 - execution_type: execution type filter
                 - start_date: filter logs after this date
                 - end_date: filter logs before this date
+            offset: number of newest entries to skip
+            limit: maximum number of entries to return (None for all)
+            cursor: keyset cursor from next_cursor(); entries strictly after
+                it are returned, so no OFFSET scan is needed
         
         Returns:
-            list: UnifiedLogEntry objects
-        """
-        logs = []
+            list: UnifiedLogEntry objects, newest first
         
-        # Collect system logs
-        logs.extend(UnifiedLogCollector._get_system_logs(filters))
+        Raises:
+            ValueError: if the cursor is malformed
+        """
+        decoded = _cursor_decode(cursor) if cursor else None
+        queryset = UnifiedLogCollector._unified_queryset(filters, decoded).order_by(
+            '-log_timestamp', '-log_type', '-log_id'
+        )
+        if limit is not None:
+            queryset = queryset[offset:offset + limit]
+        elif offset:
+            queryset = queryset[offset:]
         
-        # Collect Ansible execution logs
-        logs.extend(UnifiedLogCollector._get_ansible_logs(filters))
+        # Rows are plain dicts from values(); stream them rather than caching
+        # the whole result set on the queryset
+        rows = list(queryset.iterator(chunk_size=500))
         
-        # Collect workflow execution logs
-        logs.extend(UnifiedLogCollector._get_workflow_logs(filters))
+        # Few operators create many entries: resolve usernames once per page
+        # instead of joining auth_user into every source query
+        user_ids = {row['log_user_id'] for row in rows if row['log_user_id']}
+        usernames = dict(
+            User.objects.filter(id__in=user_ids).values_list('id', 'username')
+        ) if user_ids else {}
         
-        # Collect command execution logs
-        logs.extend(UnifiedLogCollector._get_command_logs(filters))
+        return [UnifiedLogEntry.from_row(row, usernames) for row in rows]
+    
+    @staticmethod
+    def next_cursor(entry):
+        """Cursor that continues the listing after the given entry"""
+        return _cursor_encode(entry.timestamp, entry.id, entry.log_type)
+    
+    @staticmethod
+    def count_unified_logs(filters=None):
+        """
+        Total number of unified log entries matching the filters
         
-        # Sort by timestamp (newest first)
-        logs.sort(key=lambda x: x.timestamp, reverse=True)
+        Totals are cached briefly per filter set: paging through a listing
+        re-requests the same total on every page, and it is only used for
+        display, so a few seconds of staleness is acceptable.
+        """
+        key = 'unified:count:' + hashlib.md5(
+            json.dumps(filters or {}, sort_keys=True).encode()
+        ).hexdigest()
+        total = cache.get(key)
+        if total is None:
+            querysets = UnifiedLogCollector._source_querysets(filters)
+            if len(querysets) == 1:
+                total = querysets[0].count()
+            else:
+                # The per-source counts are independent; run them side by side
+                # so a cache miss costs the slowest count, not the sum
+                with ThreadPoolExecutor(max_workers=len(querysets)) as executor:
+                    total = sum(executor.map(_count_in_thread, querysets))
+            cache.set(key, total, timeout=UNIFIED_LOG_COUNT_CACHE_TIMEOUT)
+        return total
+    
+    @staticmethod
+    def _source_querysets(filters, cursor=None):
+        sources = {
+            'system': UnifiedLogCollector._get_system_logs,
+            'ansible': UnifiedLogCollector._get_ansible_logs,
+            'workflow': UnifiedLogCollector._get_workflow_logs,
+            'command': UnifiedLogCollector._get_command_logs,
+        }
+        # A log_type filter selects a single source; the others are never queried
+        log_type = (filters or {}).get('log_type')
+        if log_type in sources:
+            sources = {log_type: sources[log_type]}
         
-        return logs
+        querysets = []
+        for log_type, collect in sources.items():
+            queryset = collect(filters)
+            if cursor is not None:
+                queryset = _after_cursor(queryset, log_type, cursor)
+            querysets.append(queryset)
+        return querysets
+    
+    @staticmethod
+    def _unified_queryset(filters, cursor=None):
+        first, *rest = UnifiedLogCollector._source_querysets(filters, cursor)
+        return first.union(*rest, all=True) if rest else first
     
     @staticmethod
     def _get_system_logs(filters):
-        """Get system logs as unified entries"""
-        from django.db.models import Q
-        
+        """Get system logs projected onto the unified columns"""
         queryset = SystemLog.objects.all()
         
         # Apply filters
@@ -114,10 +379,8 @@ class UnifiedLogCollector:
             if filters.get('level'):
                 queryset = queryset.filter(level=filters['level'])
             
-            if filters.get('log_type') and filters['log_type'] == 'system':
+            if filters.get('log_type') == 'system':
                 queryset = queryset.filter(type=filters.get('type', 'SYSTEM'))
-            elif filters.get('log_type') and filters['log_type'] != 'system':
-                queryset = queryset.none()  # Exclude system logs
             
             if filters.get('start_date'):
                 queryset = queryset.filter(created_at__gte=filters['start_date'])
@@ -125,34 +388,20 @@ class UnifiedLogCollector:
             if filters.get('end_date'):
                 queryset = queryset.filter(created_at__lte=filters['end_date'])
         
-        logs = []
-        for log in queryset:
-            entry = UnifiedLogEntry(
-                log_type='system',
-                level=log.level,
-                message=log.message,
-                timestamp=log.created_at,
-                details={'details': log.details} if log.details else {},
-                user=log.user.username if log.user else 'System',
-                device_name=None,
-                execution_id=None,
-                execution_type=None,
-                id=log.id,
-                object_type=log.object_type,
-                object_id=log.object_id,
-                old_values=log.old_values,
-                new_values=log.new_values
-            )
-            logs.append(entry)
-        
-        return logs
+        return _project(
+            queryset, 'system',
+            log_id=F('id'),
+            log_level=F('level'),
+            log_timestamp=F('created_at'),
+            log_message=F('message'),
+            log_user_id=F('user_id'),
+            log_details=F('details'),
+        )
     
     @staticmethod
     def _get_ansible_logs(filters):
-        """Get Ansible execution logs as unified entries"""
-        from django.db.models import Q
-        
-        queryset = AnsibleExecution.objects.select_related('playbook', 'created_by')
+        """Get Ansible execution logs projected onto the unified columns"""
+        queryset = AnsibleExecution.objects.all()
         
         # Apply filters
         if filters:
@@ -163,15 +412,8 @@ class UnifiedLogCollector:
                     Q(stderr__icontains=filters['search'])
                 )
             
-            if filters.get('level') == 'ERROR':
-                queryset = queryset.filter(return_code__gt=0)
-            elif filters.get('level') == 'INFO':
-                queryset = queryset.filter(return_code=0)
-            
-            if filters.get('log_type') and filters['log_type'] == 'ansible':
-                pass  # Include all Ansible logs
-            elif filters.get('log_type') and filters['log_type'] != 'ansible':
-                queryset = queryset.none()  # Exclude Ansible logs
+            if filters.get('level'):
+                queryset = queryset.filter(level=filters['level'])
             
             if filters.get('start_date'):
                 queryset = queryset.filter(created_at__gte=filters['start_date'])
@@ -179,44 +421,27 @@ class UnifiedLogCollector:
             if filters.get('end_date'):
                 queryset = queryset.filter(created_at__lte=filters['end_date'])
         
-        logs = []
-        for execution in queryset:
-            # Create main execution log entry
-            level = 'ERROR' if execution.return_code and execution.return_code > 0 else 'INFO'
-            status = execution.status
-            
-            entry = UnifiedLogEntry(
-                log_type='ansible',
-                level=level,
-                message=f"Ansible Playbook: {execution.playbook.name} - Status: {status}",
-                timestamp=execution.created_at,
-                details={
-                    'execution_time': execution.execution_time,
-                    'return_code': execution.return_code,
-                    'started_at': execution.started_at,
-                    'completed_at': execution.completed_at,
-                },
-                user=execution.created_by.username if execution.created_by else 'System',
-                device_name=None,  # Ansible might target multiple devices
-                execution_id=str(execution.id),
-                execution_type='ansible',
-                stdout=execution.stdout,
-                stderr=execution.stderr,
-                playbook_name=execution.playbook.name,
-                id=execution.id
-            )
-            logs.append(entry)
-        
-        return logs
+        return _project(
+            queryset, 'ansible',
+            log_id=F('id'),
+            log_level=F('level'),
+            log_timestamp=F('created_at'),
+            log_status=F('status'),
+            log_user_id=F('created_by_id'),
+            log_execution_id=F('id'),
+            log_name=F('playbook__name'),
+            log_stdout=Substr('stdout', 1, LOG_PREVIEW_LENGTH),
+            log_stderr=Substr('stderr', 1, LOG_PREVIEW_LENGTH),
+            log_return_code=F('return_code'),
+            log_execution_time=F('execution_time'),
+            log_started_at=F('started_at'),
+            log_completed_at=F('completed_at'),
+        )
     
     @staticmethod
     def _get_workflow_logs(filters):
-        """Get workflow execution logs as unified entries"""
-        from django.db.models import Q
-        
-        queryset = WorkflowExecution.objects.select_related(
-            'workflow', 'device', 'created_by'
-        )
+        """Get workflow execution logs projected onto the unified columns"""
+        queryset = WorkflowExecution.objects.all()
         
         # Apply filters
         if filters:
@@ -228,15 +453,7 @@ class UnifiedLogCollector:
                 )
             
             if filters.get('level'):
-                if filters['level'] == 'ERROR':
-                    queryset = queryset.filter(status__in=['failed', 'rolled_back'])
-                elif filters['level'] == 'INFO':
-                    queryset = queryset.filter(status='completed')
-            
-            if filters.get('log_type') and filters['log_type'] == 'workflow':
-                pass  # Include all workflow logs
-            elif filters.get('log_type') and filters['log_type'] != 'workflow':
-                queryset = queryset.none()  # Exclude workflow logs
+                queryset = queryset.filter(level=filters['level'])
             
             if filters.get('device_name'):
                 queryset = queryset.filter(device__name__icontains=filters['device_name'])
@@ -247,44 +464,25 @@ class UnifiedLogCollector:
             if filters.get('end_date'):
                 queryset = queryset.filter(created_at__lte=filters['end_date'])
         
-        logs = []
-        for execution in queryset:
-            # Create main execution log entry
-            level = 'ERROR' if execution.status in ['failed', 'rolled_back'] else 'INFO'
-            
-            entry = UnifiedLogEntry(
-                log_type='workflow',
-                level=level,
-                message=f"Workflow: {execution.workflow.name} on {execution.device.name} - Status: {execution.status}",
-                timestamp=execution.created_at,
-                details={
-                    'current_stage': execution.current_stage,
-                    'execution_time': (
-                        execution.completed_at - execution.started_at
-                    ).total_seconds() if execution.started_at and execution.completed_at else None,
-                    'error_message': execution.error_message,
-                },
-                user=execution.created_by.username if execution.created_by else 'System',
-                device_name=execution.device.name,
-                execution_id=str(execution.id),
-                execution_type='workflow',
-                workflow_name=execution.workflow.name,
-                id=execution.id
-            )
-            logs.append(entry)
-        
-        return logs
+        return _project(
+            queryset, 'workflow',
+            log_id=F('id'),
+            log_level=F('level'),
+            log_timestamp=F('created_at'),
+            log_status=F('status'),
+            log_user_id=F('created_by_id'),
+            log_device_name=F('device__name'),
+            log_execution_id=F('id'),
+            log_name=F('workflow__name'),
+            log_stage=F('current_stage'),
+            log_execution_time=F('execution_time'),
+            log_error_message=F('error_message'),
+        )
     
     @staticmethod
     def _get_command_logs(filters):
-        """Get command execution logs as unified entries"""
-        from django.db.models import Q
-        
-        queryset = CommandExecution.objects.select_related(
-            'workflow_execution__workflow',
-            'workflow_execution__device',
-            'workflow_execution__created_by'
-        )
+        """Get command execution logs projected onto the unified columns"""
+        queryset = CommandExecution.objects.all()
         
         # Apply filters
         if filters:
@@ -296,15 +494,7 @@ class UnifiedLogCollector:
                 )
             
             if filters.get('level'):
-                if filters['level'] == 'ERROR':
-                    queryset = queryset.filter(status='failed')
-                elif filters['level'] == 'INFO':
-                    queryset = queryset.filter(status='completed')
-            
-            if filters.get('log_type') and filters['log_type'] == 'command':
-                pass  # Include all command logs
-            elif filters.get('log_type') and filters['log_type'] != 'command':
-                queryset = queryset.none()  # Exclude command logs
+                queryset = queryset.filter(level=filters['level'])
             
             if filters.get('device_name'):
                 queryset = queryset.filter(
@@ -317,32 +507,22 @@ class UnifiedLogCollector:
             if filters.get('end_date'):
                 queryset = queryset.filter(started_at__lte=filters['end_date'])
         
-        logs = []
-        for cmd_exec in queryset:
-            level = 'ERROR' if cmd_exec.status == 'failed' else 'INFO'
-            
-            entry = UnifiedLogEntry(
-                log_type='command',
-                level=level,
-                message=f"Command [{cmd_exec.stage}]: {cmd_exec.command[:100]}",
-                timestamp=cmd_exec.started_at or cmd_exec.completed_at,
-                details={
-                    'stage': cmd_exec.stage,
-                    'exit_code': cmd_exec.exit_code,
-                    'execution_time': cmd_exec.execution_time,
-                    'validation_result': cmd_exec.validation_result,
-                },
-                user=cmd_exec.workflow_execution.created_by.username if cmd_exec.workflow_execution.created_by else 'System',
-                device_name=cmd_exec.workflow_execution.device.name,
-                execution_id=str(cmd_exec.workflow_execution.id),
-                execution_type='command',
-                command=cmd_exec.command,
-                workflow_name=cmd_exec.workflow_execution.workflow.name,
-                id=cmd_exec.id
-            )
-            logs.append(entry)
-        
-        return logs
+        return _project(
+            queryset, 'command',
+            log_id=F('id'),
+            log_level=F('level'),
+            log_timestamp=F('started_at'),
+            log_status=F('status'),
+            log_user_id=F('workflow_execution__created_by_id'),
+            log_device_name=F('workflow_execution__device__name'),
+            log_execution_id=F('workflow_execution_id'),
+            log_name=F('workflow_execution__workflow__name'),
+            log_command=F('command'),
+            log_stage=F('stage'),
+            log_return_code=F('exit_code'),
+            log_execution_time=F('execution_time'),
+            log_validation_result=F('validation_result'),
+        )
 
 
 def log_ansible_execution_start(execution, user=None):
@@ -398,6 +578,11 @@ def get_execution_logs(execution_id, execution_type):
         if execution_type == 'ansible':
             execution = AnsibleExecution.objects.select_related(
                 'playbook', 'inventory', 'created_by'
+            ).only(
+                'id', 'status', 'extra_vars', 'tags', 'skip_tags', 'created_at',
+                'started_at', 'completed_at', 'execution_time', 'return_code',
+                'stdout', 'stderr', 'playbook', 'inventory', 'created_by',
+                'playbook__name', 'inventory__name', 'created_by__username'
             ).get(id=execution_id)
             
             return {
@@ -424,7 +609,11 @@ def get_execution_logs(execution_id, execution_type):
         elif execution_type == 'workflow':
             execution = WorkflowExecution.objects.select_related(
                 'workflow', 'device', 'created_by'
-            ).prefetch_related('command_executions', 'variables').get(id=execution_id)
+            ).defer(
+                'workflow__pre_check_commands', 'workflow__implementation_commands',
+                'workflow__post_check_commands', 'workflow__rollback_commands',
+                'workflow__validation_rules'
+            ).get(id=execution_id)
             
             return {
                 'execution_id': str(execution.id),
@@ -445,31 +634,14 @@ def get_execution_logs(execution_id, execution_type):
                 'implementation_results': execution.get_implementation_results(),
                 'post_check_results': execution.get_post_check_results(),
                 'rollback_results': execution.get_rollback_results(),
-                'command_executions': [
-                    {
-                        'command': cmd.command,
-                        'stage': cmd.stage,
-                        'status': cmd.status,
-                        'output': cmd.output,
-                        'error_output': cmd.error_output,
-                        'exit_code': cmd.exit_code,
-                        'execution_time': cmd.execution_time,
-                        'validation_result': cmd.validation_result,
-                        'started_at': cmd.started_at,
-                        'completed_at': cmd.completed_at,
-                    }
-                    for cmd in execution.command_executions.all()
-                ],
-                'variables': [
-                    {
-                        'name': var.name,
-                        'value': var.value,
-                        'description': var.description,
-                        'source_command': var.source_command,
-                        'source_stage': var.source_stage,
-                    }
-                    for var in execution.variables.all()
-                ]
+                # values() builds the response dicts directly, skipping model instances
+                'command_executions': list(execution.command_executions.values(
+                    'command', 'stage', 'status', 'output', 'error_output', 'exit_code',
+                    'execution_time', 'validation_result', 'started_at', 'completed_at'
+                )),
+                'variables': list(execution.variables.values(
+                    'name', 'value', 'description', 'source_command', 'source_stage'
+                ))
             }
         
         return None
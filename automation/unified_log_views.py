@@ -1,13 +1,21 @@
 """
 Unified logging API views for integrating system logs, workflow logs, and Ansible logs
 """
+import heapq
+import itertools
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.core.paginator import Paginator
+from django.conf import settings
 from django.contrib.auth.models import User
-from .unified_log_utils import UnifiedLogCollector, get_execution_logs
-from .models import SystemLog, AnsibleExecution, WorkflowExecution
+from django.core.cache import cache
+from django.db import connection
+from .renderers import FastJSONRenderer
+from .unified_log_utils import (
+    UnifiedLogCollector, get_execution_logs,
+    recent_executions_cache_key, RECENT_EXECUTIONS_CACHE_TIMEOUT
+)
+from .models import SystemLog, AnsibleExecution, WorkflowExecution, CommandExecution, Device
 
 
 class UnifiedLogViewSet(viewsets.ViewSet):
@@ -15,6 +23,7 @@ class UnifiedLogViewSet(viewsets.ViewSet):
     ViewSet for unified logging API that consolidates all log types
     """
     permission_classes = []  # Allow any for now
+    renderer_classes = [FastJSONRenderer]
     
     def list(self, request):
         """
@@ -28,6 +37,8 @@ class UnifiedLogViewSet(viewsets.ViewSet):
         - execution_type: filter by execution type
         - start_date: filter logs after this date (ISO format)
         - end_date: filter logs before this date (ISO format)
+        - cursor: next_cursor from the previous response (keyset pagination;
+          takes precedence over page)
         - page: page number (default: 1)
         - per_page: items per page (default: 20)
         """
@@ -40,25 +51,37 @@ class UnifiedLogViewSet(viewsets.ViewSet):
                 if value:
                     filters[param] = value
             
-            # Get unified logs
-            logs = UnifiedLogCollector.get_unified_logs(filters)
+            # Pagination is done by the database; only this page is fetched.
+            # A cursor continues after the last entry seen (no OFFSET scan);
+            # page numbers are kept for existing clients.
+            cursor = request.GET.get('cursor')
+            page = max(int(request.GET.get('page', 1)), 1)
+            per_page = max(int(request.GET.get('per_page', 20)), 1)
+            offset = 0 if cursor else (page - 1) * per_page
             
-            # Pagination
-            page = int(request.GET.get('page', 1))
-            per_page = int(request.GET.get('per_page', 20))
-            paginator = Paginator(logs, per_page)
-            page_obj = paginator.get_page(page)
+            try:
+                # Fetch one extra entry to learn whether another page exists
+                logs = UnifiedLogCollector.get_unified_logs(
+                    filters, offset=offset, limit=per_page + 1, cursor=cursor
+                )
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            has_next = len(logs) > per_page
+            logs = logs[:per_page]
+            
+            total = UnifiedLogCollector.count_unified_logs(filters)
             
             # Convert to dictionaries
-            log_data = [log.to_dict() for log in page_obj]
+            log_data = [log.to_dict() for log in logs]
             
             return Response({
                 'logs': log_data,
-                'total': len(logs),
-                'page': page,
+                'total': total,
+                'page': None if cursor else page,
                 'per_page': per_page,
-                'has_next': page_obj.has_next(),
-                'has_previous': page_obj.has_previous(),
+                'has_next': has_next,
+                'has_previous': bool(cursor) or page > 1,
+                'next_cursor': UnifiedLogCollector.next_cursor(logs[-1]) if has_next else None,
                 'filters_applied': filters
             })
             
@@ -105,10 +128,16 @@ class UnifiedLogViewSet(viewsets.ViewSet):
         Get available log types and their counts
         """
         try:
-            # Get counts for each log type
-            system_count = SystemLog.objects.count()
-            ansible_count = AnsibleExecution.objects.count()
-            workflow_count = WorkflowExecution.objects.count()
+            # Get counts for each log type in a single round trip
+            tables = [
+                connection.ops.quote_name(model._meta.db_table)
+                for model in (SystemLog, AnsibleExecution, WorkflowExecution, CommandExecution)
+            ]
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT ' + ', '.join(
+                    f'(SELECT COUNT(*) FROM {table})' for table in tables
+                ))
+                system_count, ansible_count, workflow_count, command_count = cursor.fetchone()
             
             return Response({
                 'log_types': {
@@ -128,7 +157,7 @@ class UnifiedLogViewSet(viewsets.ViewSet):
                         'description': 'Workflow automation executions'
                     },
                     'command': {
-                        'count': 0,  # Will be calculated from CommandExecution if needed
+                        'count': command_count,
                         'name': 'Command Executions',
                         'description': 'Individual command executions'
                     }
@@ -146,8 +175,6 @@ class UnifiedLogViewSet(viewsets.ViewSet):
         Get available devices for filtering
         """
         try:
-            from .models import Device
-            
             devices = Device.objects.all().values('id', 'name', 'ip_address', 'device_type')
             
             return Response({
@@ -170,21 +197,35 @@ class UnifiedLogViewSet(viewsets.ViewSet):
         try:
             limit = int(request.GET.get('limit', 10))
             
+            # Cached until an execution is saved (see automation.signals);
+            # only with a shared cache, since executions are saved by workers
+            use_cache = settings.SHARED_CACHE
+            if use_cache:
+                cache_key = recent_executions_cache_key(limit)
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    return Response({'executions': cached})
+            
             # Get recent Ansible executions
+            # Only the listed columns are loaded; joined playbook and
+            # workflow rows carry large YAML/JSON blobs
             ansible_executions = AnsibleExecution.objects.select_related(
                 'playbook', 'created_by'
-            ).order_by('-created_at')[:limit]
+            ).only(
+                'id', 'status', 'created_at', 'playbook', 'created_by',
+                'playbook__name', 'created_by__username'
+            ).order_by('-created_at', '-id')[:limit]
             
             # Get recent Workflow executions
             workflow_executions = WorkflowExecution.objects.select_related(
                 'workflow', 'device', 'created_by'
-            ).order_by('-created_at')[:limit]
-            
-            # Combine and sort by timestamp
-            all_executions = []
+            ).only(
+                'id', 'status', 'created_at', 'workflow', 'device', 'created_by',
+                'workflow__name', 'device__name', 'created_by__username'
+            ).order_by('-created_at', '-id')[:limit]
             
-            for exec in ansible_executions:
-                all_executions.append({
+            ansible_entries = (
+                {
                     'id': str(exec.id),
                     'type': 'ansible',
                     'name': exec.playbook.name,
@@ -192,10 +233,12 @@ class UnifiedLogViewSet(viewsets.ViewSet):
                     'created_at': exec.created_at,
                     'created_by': exec.created_by.username if exec.created_by else 'System',
                     'device_name': None,  # Ansible might target multiple devices
-                })
+                }
+                for exec in ansible_executions
+            )
             
-            for exec in workflow_executions:
-                all_executions.append({
+            workflow_entries = (
+                {
                     'id': str(exec.id),
                     'type': 'workflow',
                     'name': f"{exec.workflow.name} on {exec.device.name}",
@@ -203,13 +246,19 @@ class UnifiedLogViewSet(viewsets.ViewSet):
                     'created_at': exec.created_at,
                     'created_by': exec.created_by.username if exec.created_by else 'System',
                     'device_name': exec.device.name,
-                })
-            
-            # Sort by created_at descending
-            all_executions.sort(key=lambda x: x['created_at'], reverse=True)
+                }
+                for exec in workflow_executions
+            )
             
-            # Limit results
-            all_executions = all_executions[:limit]
+            # Both sources are already sorted newest first, so merge them
+            # and stop after limit entries instead of sorting the union
+            merged = heapq.merge(
+                ansible_entries, workflow_entries,
+                key=lambda x: (x['created_at'], x['id']), reverse=True
+            )
+            all_executions = list(itertools.islice(merged, limit))
+            if use_cache:
+                cache.set(cache_key, all_executions, timeout=RECENT_EXECUTIONS_CACHE_TIMEOUT)
             
             return Response({
                 'executions': all_executions
@@ -23,15 +23,4 @@ urlpatterns = [
     
     # Catch-all route for React Router (must be last)
     path('<path:path>', views.react_app_view, name='react_catch_all'),
-    
-    # Legacy Django template routes (can be removed after full migration)
-    # path('', views.dashboard_view, name='dashboard'),
-    # path('dashboard/', views.dashboard_view, name='dashboard'),
-    # path('devices/', views.device_list_view, name='device_list'),
-    # path('devices/create/', views.create_device_view, name='create_device'),
-    # path('workflows/', views.workflow_list_view, name='workflow_list'),
-    # path('workflows/create/', views.create_workflow_view, name='create_workflow'),
-    # path('workflows/execute/', views.workflow_execute_view, name='workflow_execute'),
-    # path('executions/', views.execution_list_view, name='execution_list'),
-    # path('executions/<str:execution_id>/', views.execution_detail_view, name='execution_detail'),
-]
\ No newline at end of file
+]
@@ -1,20 +1,15 @@
-from django.shortcuts import render
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 import os
 
-def react_app_view(request, path=None):
-    """Serve the React app"""
-    # Get the path to the React build directory
-    react_build_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'frontend', 'build')
-    index_path = os.path.join(react_build_path, 'index.html')
-    
-    try:
-        with open(index_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return HttpResponse(content)
-    except FileNotFoundError:
-        # If React app hasn't been built yet, show a message
-        return HttpResponse("""
+# Path to the React build's index.html, resolved once at import
+_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'frontend', 'build', 'index.html'
+)
+
+# Shown when the React app hasn't been built yet
+_NOT_BUILT_HTML = b"""
         <html>
         <head><title>Network Automation</title></head>
         <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
@@ -24,44 +19,29 @@ def react_app_view(request, path=None):
             <p>Then restart the Django server.</p>
         </body>
         </html>
-        """)
-
-
-def dashboard_view(request):
-    """Dashboard view - redirects to React app"""
-    return react_app_view(request)
-
-
-def device_list_view(request):
-    """Device list view - redirects to React app"""
-    return react_app_view(request)
-
-
-def workflow_list_view(request):
-    """Workflow list view - redirects to React app"""
-    return react_app_view(request)
-
+        """
 
-def execution_list_view(request):
-    """Execution list view - redirects to React app"""
-    return react_app_view(request)
 
-
-def create_device_view(request):
-    """Create device view - redirects to React app"""
-    return react_app_view(request)
-
-
-def create_workflow_view(request):
-    """Create workflow view - redirects to React app"""
-    return react_app_view(request)
-
-
-def workflow_execute_view(request):
-    """Workflow execute view - redirects to React app"""
-    return react_app_view(request)
-
-
-def execution_detail_view(request, execution_id):
-    """Execution detail view - redirects to React app"""
-    return react_app_view(request)
\ No newline at end of file
+def react_app_view(request, path=None, **kwargs):
+    """Serve the React app for every SPA route; route kwargs are ignored"""
+    try:
+        stat = os.stat(_INDEX_PATH)
+    except FileNotFoundError:
+        # If React app hasn't been built yet, show a message
+        return HttpResponse(_NOT_BUILT_HTML)
+
+    # index.html names the hashed bundles of the current build, so browsers
+    # must revalidate it on every load; a rebuild changes mtime and size
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        # FileResponse hands the file to wsgi.file_wrapper, which gunicorn
+        # serves with sendfile() instead of copying it through Python
+        response = FileResponse(open(_INDEX_PATH, 'rb'), content_type='text/html')
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, no_cache=True)
+    return response
@@ -1,11 +1,35 @@
 from drf_spectacular.views import SpectacularSwaggerView
 from django.template.response import TemplateResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
+
+# Swagger UI options passed to the template; constant for every request
+SWAGGER_UI_SETTINGS = {
+    'deepLinking': True,
+    'displayOperationId': True,
+    'defaultModelsExpandDepth': 1,
+    'defaultModelExpandDepth': 1,
+    'docExpansion': 'list',
+    'filter': True,
+    'persistAuthorization': True,
+    'displayRequestDuration': True,
+    'tryItOutEnabled': True,
+    'syntaxHighlight': {
+        'activated': True,
+        'theme': 'monokai'
+    }
+}
+
+# The docs page only changes on deploy, so the rendered HTML is cached
+SWAGGER_UI_CACHE_TIMEOUT = 300
+
 
 class CustomSpectacularSwaggerView(SpectacularSwaggerView):
     """
     Custom Swagger UI view with modern styling and enhanced features
     """
 
+    @method_decorator(cache_page(SWAGGER_UI_CACHE_TIMEOUT))
     def get(self, request, *args, **kwargs):
         # Get the original response data
         response = super().get(request, *args, **kwargs)
@@ -20,21 +44,7 @@ class CustomSpectacularSwaggerView(SpectacularSwaggerView):
                     'title': 'Network Automation API - Modern Docs',
                     'description': '🚀 Modern, comprehensive API documentation for Network Automation',
                     'version': '1.0.0',
-                    'swagger_settings': {
-                        'deepLinking': True,
-                        'displayOperationId': True,
-                        'defaultModelsExpandDepth': 1,
-                        'defaultModelExpandDepth': 1,
-                        'docExpansion': 'list',
-                        'filter': True,
-                        'persistAuthorization': True,
-                        'displayRequestDuration': True,
-                        'tryItOutEnabled': True,
-                        'syntaxHighlight': {
-                            'activated': True,
-                            'theme': 'monokai'
-                        }
-                    }
+                    'swagger_settings': SWAGGER_UI_SETTINGS
                 }
             )
 
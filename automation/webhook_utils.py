@@ -1,12 +1,130 @@
 import requests
 import json
 import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import Length
+from django.urls import reverse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # orjson is several times faster than the stdlib encoder and returns bytes
+    import orjson
+except ImportError:
+    orjson = None
+from django.db import connection
 from django.utils import timezone
-from .models import SystemLog, WorkflowExecution, WebhookConfiguration
+from .models import AnsibleExecution, SystemLog, WorkflowExecution, WebhookConfiguration
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent webhook deliveries for a single event
+WEBHOOK_MAX_WORKERS = 8
+
+# (connect, read) timeouts for a delivery; a short connect timeout keeps
+# the in-band connection retries from stalling the workflow thread
+WEBHOOK_TIMEOUT = (3, 10)
+
+# Deliveries that fail with a network error or one of these statuses are
+# retried out-of-band by a Celery task, with exponential backoff, up to
+# WEBHOOK_MAX_ATTEMPTS attempts in total. This is the only layer that
+# resends a request the receiver may have seen.
+WEBHOOK_MAX_ATTEMPTS = 5
+WEBHOOK_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+ACTIVE_WEBHOOKS_CACHE_KEY = 'webhook:active'
+ACTIVE_WEBHOOKS_CACHE_TIMEOUT = 60
+
+
+def _build_session():
+    """Shared HTTP session so deliveries to the same host reuse keep-alive connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=50,
+        # Only connection failures are retried here: the POST never reached
+        # the receiver, so resending cannot duplicate it. Anything after the
+        # request was sent is left to the retry_webhook_delivery task.
+        max_retries=Retry(connect=2, read=0, status=0, backoff_factor=0.3),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_SESSION = _build_session()
+
+
+def _active_webhooks():
+    """
+    (configuration id, frozenset of events) for every active webhook. Read
+    on every execution event but rarely changed, so the list is cached when
+    the cache is shared across processes; signals drop it when a
+    configuration is saved. Only ids and events are cached: the full
+    configuration, secret included, is loaded by _webhooks_for() at send time.
+    """
+    webhooks = cache.get(ACTIVE_WEBHOOKS_CACHE_KEY) if settings.SHARED_CACHE else None
+    if webhooks is None:
+        webhooks = [
+            (config.id, frozenset(config.get_events_list()))
+            for config in WebhookConfiguration.objects.filter(is_active=True).only('id', 'events')
+        ]
+        if settings.SHARED_CACHE:
+            cache.set(ACTIVE_WEBHOOKS_CACHE_KEY, webhooks, timeout=ACTIVE_WEBHOOKS_CACHE_TIMEOUT)
+    return webhooks
+
+
+def _webhooks_for(config_ids):
+    """Load the active configurations to deliver to from the database"""
+    if not config_ids:
+        return []
+    return list(WebhookConfiguration.objects.filter(id__in=config_ids, is_active=True))
+
+
+def invalidate_active_webhooks_cache():
+    """Drop the cached active webhook configurations"""
+    cache.delete(ACTIVE_WEBHOOKS_CACHE_KEY)
+
+
+def _webhook_headers(config, event_type, timestamp=None):
+    """Request headers for delivering event_type to config"""
+    headers = {
+        'Content-Type': 'application/json; charset=utf-8',
+        'User-Agent': 'NetworkAutomation/Webhook',
+        'X-Event-Type': event_type,
+        'X-Timestamp': timestamp or timezone.now().isoformat()
+    }
+
+    # Add secret key if configured
+    if config.secret_key:
+        headers['X-Webhook-Secret'] = config.secret_key
+
+    return headers
+
+
+def _schedule_retry(config_id, body, event_type, attempt):
+    """Queue redelivery attempt number attempt after a jittered backoff"""
+    from .tasks import retry_webhook_delivery
+
+    try:
+        retry_webhook_delivery.apply_async(
+            args=[str(config_id), body.decode('utf-8'), event_type, attempt],
+            countdown=2 ** attempt + random.uniform(0, 1)
+        )
+    except Exception as e:
+        logger.error(f"Could not schedule webhook retry for configuration {config_id}: {e}")
+
+
+def _dumps(payload):
+    """Serialize a webhook payload to UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
 class WebhookManager:
     """
     Webhook management system for sending execution notifications
@@ -23,33 +141,39 @@ class WebhookManager:
         """
         try:
             # Get all active webhook configurations that should trigger on this event
-            webhook_configs = WebhookConfiguration.objects.filter(is_active=True)
+            webhook_configs = _active_webhooks()
 
             if not webhook_configs:
                 logger.info("No active webhook configurations found, skipping notification")
                 return False
 
             # Filter webhooks that should trigger for this event
-            webhooks_to_trigger = []
-            for config in webhook_configs:
-                events = config.get_events_list()
-                if event_type in events:
-                    webhooks_to_trigger.append(config)
+            webhooks_to_trigger = _webhooks_for([
+                config_id for config_id, events in webhook_configs if event_type in events
+            ])
 
             if not webhooks_to_trigger:
                 logger.info(f"No webhook configurations found for event {event_type}, skipping notification")
                 return False
 
-            # Send webhook to all matching configurations
-            success_count = 0
-            for config in webhooks_to_trigger:
-                try:
-                    webhook_success = WebhookManager._send_single_webhook(config, workflow_execution, event_type)
-                    if webhook_success:
-                        success_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to send webhook for configuration {config.name}: {e}")
-                    continue
+            # Build and serialize the payload once for every config, loading
+            # the workflow and device with the execution
+            workflow_execution = WorkflowExecution.objects.select_related(
+                'workflow', 'device'
+            ).get(pk=workflow_execution.pk)
+            # One event timestamp shared by the payload and every delivery
+            timestamp = timezone.now().isoformat()
+            body = _dumps(WebhookManager._prepare_payload(workflow_execution, event_type, timestamp))
+
+            # Send webhook to all matching configurations; delivery logs are
+            # collected and written in one INSERT afterwards
+            logs = []
+            success_count = WebhookManager._deliver_concurrently(
+                webhooks_to_trigger, workflow_execution, event_type, body, logs, timestamp
+            )
+
+            if logs:
+                SystemLog.objects.bulk_create(logs, batch_size=100)
 
             return success_count > 0
 
@@ -58,108 +182,160 @@ class WebhookManager:
             return False
 
     @staticmethod
-    def _send_single_webhook(config, workflow_execution, event_type):
+    def _deliver_concurrently(configs, execution, event_type, body, logs, timestamp=None):
         """
-        Send a single webhook notification to a specific configuration
+        Call _send_single_webhook for every config on a thread pool, so an
+        event costs the slowest endpoint rather than the sum of all of them.
+        Returns the number of successful deliveries.
         """
-        try:
-            # Prepare payload
-            payload = WebhookManager._prepare_payload(workflow_execution, event_type)
+        def deliver(config):
+            try:
+                return WebhookManager._send_single_webhook(
+                    config, execution, event_type, body, logs, timestamp
+                )
+            except Exception as e:
+                logger.error(f"Failed to send webhook for configuration {config.name}: {e}")
+                return False
+            finally:
+                # Worker threads get their own DB connection; don't leak it
+                connection.close()
+
+        if len(configs) == 1:
+            try:
+                return int(WebhookManager._send_single_webhook(
+                    configs[0], execution, event_type, body, logs, timestamp
+                ))
+            except Exception as e:
+                logger.error(f"Failed to send webhook for configuration {configs[0].name}: {e}")
+                return 0
+
+        with ThreadPoolExecutor(max_workers=min(len(configs), WEBHOOK_MAX_WORKERS)) as executor:
+            return sum(1 for success in executor.map(deliver, configs) if success)
 
-            # Send webhook
-            headers = {
-                'Content-Type': 'application/json',
-                'User-Agent': 'NetworkAutomation/Webhook',
-                'X-Event-Type': event_type,
-                'X-Timestamp': timezone.now().isoformat()
-            }
+    @staticmethod
+    def _send_single_webhook(config, execution, event_type, body, logs, timestamp=None):
+        """
+        Send a single webhook notification to a specific configuration
 
-            # Add secret key if configured
-            if config.secret_key:
-                headers['X-Webhook-Secret'] = config.secret_key
+        execution is the WorkflowExecution or AnsibleExecution the event is
+        about, body the already serialized payload and timestamp the event's
+        ISO time for X-Timestamp. An unsaved SystemLog describing the
+        delivery is appended to logs
+        """
+        if isinstance(execution, AnsibleExecution):
+            label, execution_key = 'Ansible webhook', 'ansible_execution_id'
+        else:
+            label, execution_key = 'Webhook', 'workflow_execution_id'
 
-            response = requests.post(
+        try:
+            # Send webhook
+            response = _SESSION.post(
                 config.webhook_url,
-                data=json.dumps(payload),
-                headers=headers,
-                timeout=10  # 10 second timeout
+                data=body,
+                headers=_webhook_headers(config, event_type, timestamp),
+                timeout=WEBHOOK_TIMEOUT
             )
 
             # Log webhook response
-            logger.info(f"Webhook sent to {config.webhook_url}")
+            logger.info(f"{label} sent to {config.webhook_url}")
             logger.info(f"Response status: {response.status_code}")
             logger.info(f"Response: {response.text}")
 
             # Log system event
-            SystemLog.objects.create(
+            logs.append(SystemLog(
                 level='INFO',
                 type='WEBHOOK',
-                message=f"Webhook notification sent for {event_type} to {config.name}",
+                message=f"{label} notification sent for {event_type} to {config.name}",
                 details=json.dumps({
                     'webhook_config_id': str(config.id),
-                    'workflow_execution_id': str(workflow_execution.id),
+                    execution_key: str(execution.id),
                     'status_code': response.status_code,
                     'response': response.text[:500]  # Limit response length
                 }),
                 object_type='WebhookConfiguration',
                 object_id=str(config.id)
-            )
+            ))
+
+            if response.status_code in WEBHOOK_RETRY_STATUSES:
+                _schedule_retry(config.id, body, event_type, 1)
 
             return response.status_code == 200
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Webhook delivery failed for {config.name}: {e}")
+            logger.error(f"{label} delivery failed for {config.name}: {e}")
+            _schedule_retry(config.id, body, event_type, 1)
 
             # Log error
-            SystemLog.objects.create(
+            logs.append(SystemLog(
                 level='ERROR',
                 type='WEBHOOK',
-                message=f"Webhook delivery failed for {config.name}: {str(e)}",
+                message=f"{label} delivery failed for {config.name}: {str(e)}",
                 details=json.dumps({
                     'webhook_config_id': str(config.id),
-                    'workflow_execution_id': str(workflow_execution.id),
+                    execution_key: str(execution.id),
                     'error': str(e)
                 }),
                 object_type='WebhookConfiguration',
                 object_id=str(config.id)
-            )
+            ))
 
             return False
         except Exception as e:
-            logger.error(f"Webhook error for {config.name}: {e}")
+            logger.error(f"{label} error for {config.name}: {e}")
             return False
 
     @staticmethod
-    def _prepare_payload(workflow_execution, event_type):
+    def _prepare_payload(workflow_execution, event_type, timestamp=None):
         """
         Prepare webhook payload with execution details
+
+        With WEBHOOK_LINK_COMMAND_OUTPUT, command output is referenced by
+        URL rather than embedded: only its length is read from the
+        database, and output is stripped from the stage results too
         """
         workflow = workflow_execution.workflow
         device = workflow_execution.device
-
-        # Get command executions for detailed results
-        command_executions = workflow_execution.command_executions.all()
+        link_output = settings.WEBHOOK_LINK_COMMAND_OUTPUT
+
+        # Get command executions for detailed results as plain dicts
+        fields = (
+            'id', 'command', 'stage', 'status', 'exit_code', 'execution_time',
+            'started_at', 'completed_at',
+        )
+        if link_output:
+            command_executions = workflow_execution.command_executions.values(
+                *fields,
+                output_length=Length('output'),
+                error_output_length=Length('error_output'),
+            )
+        else:
+            command_executions = workflow_execution.command_executions.values(
+                *fields, 'output', 'error_output'
+            )
 
         # Prepare command results
-        commands = []
-        for cmd_exec in command_executions:
-            commands.append({
-                'command': cmd_exec.command,
-                'stage': cmd_exec.stage,
-                'status': cmd_exec.status,
-                'output': cmd_exec.output,
-                'error_output': cmd_exec.error_output,
-                'exit_code': cmd_exec.exit_code,
-                'execution_time': cmd_exec.execution_time,
-                'started_at': cmd_exec.started_at.isoformat() if cmd_exec.started_at else None,
-                'completed_at': cmd_exec.completed_at.isoformat() if cmd_exec.completed_at else None
-            })
+        commands = [
+            WebhookManager._command_payload(workflow_execution, cmd_exec, link_output)
+            for cmd_exec in command_executions
+        ]
+
+        results = {
+            'pre_check': workflow_execution.get_pre_check_results(),
+            'implementation': workflow_execution.get_implementation_results(),
+            'post_check': workflow_execution.get_post_check_results(),
+            'rollback': workflow_execution.get_rollback_results()
+        }
+        if link_output:
+            results = {
+                stage: WebhookManager._strip_output(stage_results)
+                for stage, stage_results in results.items()
+            }
 
         # Build payload
         payload = {
             'event_id': str(workflow_execution.id),
             'event_type': event_type,
-            'timestamp': timezone.now().isoformat(),
+            'timestamp': timestamp or timezone.now().isoformat(),
             'workflow': {
                 'id': str(workflow.id),
                 'name': workflow.name,
@@ -183,16 +359,126 @@ class WebhookManager:
                 'duration_seconds': WebhookManager._calculate_duration(workflow_execution)
             },
             'commands': commands,
-            'results': {
-                'pre_check': workflow_execution.get_pre_check_results(),
-                'implementation': workflow_execution.get_implementation_results(),
-                'post_check': workflow_execution.get_post_check_results(),
-                'rollback': workflow_execution.get_rollback_results()
-            }
+            'results': results
         }
 
         return payload
 
+    @staticmethod
+    def redeliver(config_id, body, event_type, attempt):
+        """
+        Retry a delivery that failed with a network error or a
+        WEBHOOK_RETRY_STATUSES response
+
+        Called from the retry_webhook_delivery task with the original
+        serialized body; schedules the next attempt until
+        WEBHOOK_MAX_ATTEMPTS is reached.
+        """
+        try:
+            config = WebhookConfiguration.objects.get(id=config_id, is_active=True)
+        except WebhookConfiguration.DoesNotExist:
+            logger.info(f"Webhook configuration {config_id} is gone or inactive, dropping retry")
+            return False
+
+        error = None
+        try:
+            response = _SESSION.post(
+                config.webhook_url,
+                data=body.encode('utf-8'),
+                headers=_webhook_headers(config, event_type),
+                timeout=WEBHOOK_TIMEOUT
+            )
+        except requests.exceptions.RequestException as e:
+            error = str(e)
+        else:
+            if response.status_code in WEBHOOK_RETRY_STATUSES:
+                error = f"HTTP {response.status_code}"
+
+        if error is not None:
+            logger.error(f"Webhook retry {attempt} failed for {config.name}: {error}")
+            if attempt + 1 < WEBHOOK_MAX_ATTEMPTS:
+                _schedule_retry(config.id, body.encode('utf-8'), event_type, attempt + 1)
+                return False
+
+            SystemLog.objects.create(
+                level='ERROR',
+                type='WEBHOOK',
+                message=f"Webhook delivery to {config.name} abandoned after {WEBHOOK_MAX_ATTEMPTS} attempts: {error}",
+                details=json.dumps({
+                    'webhook_config_id': str(config.id),
+                    'event_type': event_type,
+                    'error': error
+                }),
+                object_type='WebhookConfiguration',
+                object_id=str(config.id)
+            )
+            return False
+
+        SystemLog.objects.create(
+            level='INFO',
+            type='WEBHOOK',
+            message=f"Webhook notification sent for {event_type} to {config.name} on retry {attempt}",
+            details=json.dumps({
+                'webhook_config_id': str(config.id),
+                'status_code': response.status_code,
+                'response': response.text[:500]
+            }),
+            object_type='WebhookConfiguration',
+            object_id=str(config.id)
+        )
+        return response.status_code == 200
+
+    @staticmethod
+    def _command_payload(workflow_execution, cmd_exec, link_output):
+        """Payload entry for one command execution row, with output inline or linked"""
+        command = {
+            'command': cmd_exec['command'],
+            'stage': cmd_exec['stage'],
+            'status': cmd_exec['status'],
+            'exit_code': cmd_exec['exit_code'],
+            'execution_time': cmd_exec['execution_time'],
+            'started_at': cmd_exec['started_at'].isoformat() if cmd_exec['started_at'] else None,
+            'completed_at': cmd_exec['completed_at'].isoformat() if cmd_exec['completed_at'] else None
+        }
+        if link_output:
+            command['output_url'] = WebhookManager._command_output_url(
+                workflow_execution, cmd_exec['id']
+            )
+            command['output_length'] = cmd_exec['output_length']
+            command['error_output_url'] = WebhookManager._command_output_url(
+                workflow_execution, cmd_exec['id'], 'error'
+            )
+            command['error_output_length'] = cmd_exec['error_output_length']
+        else:
+            command['output'] = cmd_exec['output']
+            command['error_output'] = cmd_exec['error_output']
+        return command
+
+    @staticmethod
+    def _strip_output(stage_results):
+        """Copy of a stage's stored results without each command's output text"""
+        if not isinstance(stage_results, dict):
+            return stage_results
+        return {
+            key: [
+                {field: value for field, value in result.items() if field != 'output'}
+                if isinstance(result, dict) else result
+                for result in value
+            ] if isinstance(value, list) else value
+            for key, value in stage_results.items()
+        }
+
+    @staticmethod
+    def _command_output_url(workflow_execution, command_id, stream=None):
+        """Absolute URL subscribers can fetch a command's full output from"""
+        path = reverse(
+            'automation_api:execution-command-output',
+            kwargs={'pk': str(workflow_execution.id), 'command_id': str(command_id)}
+        )
+        if stream:
+            path += f'?stream={stream}'
+        return settings.WEBHOOK_BASE_URL.rstrip('/') + path
+
     @staticmethod
     def _calculate_duration(workflow_execution):
         """Calculate execution duration in seconds"""
@@ -221,16 +507,16 @@ class WebhookManager:
             }
 
             headers = {
-                'Content-Type': 'application/json',
+                'Content-Type': 'application/json; charset=utf-8',
                 'User-Agent': 'NetworkAutomation/Webhook/Test',
                 'X-Event-Type': 'test_notification'
             }
 
-            response = requests.post(
+            response = _SESSION.post(
                 webhook_url,
-                data=json.dumps(test_payload),
+                data=_dumps(test_payload),
                 headers=headers,
-                timeout=10
+                timeout=WEBHOOK_TIMEOUT
             )
 
             return response.status_code == 200, f"Test webhook sent: {response.status_code}"
@@ -249,114 +535,48 @@ class WebhookManager:
         """
         try:
             # Get all active webhook configurations that should trigger on this event
-            webhook_configs = WebhookConfiguration.objects.filter(is_active=True)
+            webhook_configs = _active_webhooks()
 
             if not webhook_configs:
                 logger.info("No active webhook configurations found, skipping notification")
                 return False
 
             # Filter webhooks that should trigger for this event
-            webhooks_to_trigger = []
-            for config in webhook_configs:
-                events = config.get_events_list()
-                if event_type in events or 'all_events' in events:
-                    webhooks_to_trigger.append(config)
+            webhooks_to_trigger = _webhooks_for([
+                config_id for config_id, events in webhook_configs
+                if event_type in events or 'all_events' in events
+            ])
 
             if not webhooks_to_trigger:
                 logger.info(f"No webhook configurations found for event {event_type}, skipping notification")
                 return False
 
-            # Send webhook to all matching configurations
-            success_count = 0
-            for config in webhooks_to_trigger:
-                try:
-                    webhook_success = WebhookManager._send_single_ansible_webhook(config, ansible_execution, event_type)
-                    if webhook_success:
-                        success_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to send ansible webhook for configuration {config.name}: {e}")
-                    continue
-
-            return success_count > 0
-
-        except Exception as e:
-            logger.error(f"Error in ansible webhook notification process: {e}")
-            return False
-
-    @staticmethod
-    def _send_single_ansible_webhook(config, ansible_execution, event_type):
-        """
-        Send a single webhook notification for Ansible execution
-        """
-        try:
-            # Prepare payload
-            payload = WebhookManager._prepare_ansible_payload(ansible_execution, event_type)
-
-            # Send webhook
-            headers = {
-                'Content-Type': 'application/json',
-                'User-Agent': 'NetworkAutomation/Webhook',
-                'X-Event-Type': event_type,
-                'X-Timestamp': timezone.now().isoformat()
-            }
-
-            # Add secret key if configured
-            if config.secret_key:
-                headers['X-Webhook-Secret'] = config.secret_key
-
-            response = requests.post(
-                config.webhook_url,
-                data=json.dumps(payload),
-                headers=headers,
-                timeout=10  # 10 second timeout
+            # Build and serialize the payload once for every config
+            ansible_execution = AnsibleExecution.objects.select_related(
+                'playbook', 'inventory'
+            ).get(pk=ansible_execution.pk)
+            # One event timestamp shared by the payload and every delivery
+            timestamp = timezone.now().isoformat()
+            body = _dumps(WebhookManager._prepare_ansible_payload(ansible_execution, event_type, timestamp))
+
+            # Send webhook to all matching configurations; delivery logs are
+            # collected and written in one INSERT afterwards
+            logs = []
+            success_count = WebhookManager._deliver_concurrently(
+                webhooks_to_trigger, ansible_execution, event_type, body, logs, timestamp
             )
 
-            # Log webhook response
-            logger.info(f"Ansible webhook sent to {config.webhook_url}")
-            logger.info(f"Response status: {response.status_code}")
-            logger.info(f"Response: {response.text}")
-
-            # Log system event
-            SystemLog.objects.create(
-                level='INFO',
-                type='WEBHOOK',
-                message=f"Ansible webhook notification sent for {event_type} to {config.name}",
-                details=json.dumps({
-                    'webhook_config_id': str(config.id),
-                    'ansible_execution_id': str(ansible_execution.id),
-                    'status_code': response.status_code,
-                    'response': response.text[:500]  # Limit response length
-                }),
-                object_type='WebhookConfiguration',
-                object_id=str(config.id)
-            )
+            if logs:
+                SystemLog.objects.bulk_create(logs, batch_size=100)
 
-            return response.status_code == 200
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Ansible webhook delivery failed for {config.name}: {e}")
-
-            # Log error
-            SystemLog.objects.create(
-                level='ERROR',
-                type='WEBHOOK',
-                message=f"Ansible webhook delivery failed for {config.name}: {str(e)}",
-                details=json.dumps({
-                    'webhook_config_id': str(config.id),
-                    'ansible_execution_id': str(ansible_execution.id),
-                    'error': str(e)
-                }),
-                object_type='WebhookConfiguration',
-                object_id=str(config.id)
-            )
+            return success_count > 0
 
-            return False
         except Exception as e:
-            logger.error(f"Ansible webhook error for {config.name}: {e}")
+            logger.error(f"Error in ansible webhook notification process: {e}")
             return False
 
     @staticmethod
-    def _prepare_ansible_payload(ansible_execution, event_type):
+    def _prepare_ansible_payload(ansible_execution, event_type, timestamp=None):
         """
         Prepare webhook payload with Ansible execution details
         """
@@ -367,7 +587,7 @@ class WebhookManager:
         payload = {
             'event_id': str(ansible_execution.id),
             'event_type': event_type,
-            'timestamp': timezone.now().isoformat(),
+            'timestamp': timestamp or timezone.now().isoformat(),
             'execution_type': 'ansible_playbook',
             'playbook': {
                 'id': str(playbook.id),
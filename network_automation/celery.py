@@ -1,4 +1,5 @@
 import os
+import sqlite3
 from celery import Celery
 
 # Set the default Django settings module for the 'celery' program.
@@ -6,6 +7,30 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'network_automation.settings')
 
 app = Celery('network_automation')
 
+try:
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+except ImportError:  # only needed by the SQLite broker/result backend
+    Engine = None
+
+if Engine is not None:
+    @event.listens_for(Engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        Use WAL journaling on the development SQLite broker and result
+        databases so the worker's polling reads don't block task
+        submission writes. synchronous=NORMAL is per connection, so it is
+        set on every new connection.
+        """
+        if not isinstance(dbapi_connection, sqlite3.Connection):
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+        finally:
+            cursor.close()
+
 # Using a string here means the worker doesn't have to serialize
 # the configuration object to child processes.
 # - namespace='CELERY' means all celery-related configuration keys
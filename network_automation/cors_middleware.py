@@ -2,42 +2,64 @@
 Simple CORS middleware for Django without external dependencies.
 This provides basic CORS support for development.
 """
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+# Header values are the same for every response
+ALLOW_METHODS = 'GET, POST, PUT, DELETE, OPTIONS'
+ALLOW_HEADERS = 'Content-Type, Authorization, X-Requested-With, X-CSRFToken'
+# Let browsers reuse a preflight answer for a day
+PREFLIGHT_MAX_AGE = '86400'
+
+
+def _load_allowed_origins():
+    return frozenset(getattr(settings, 'CORS_ALLOWED_ORIGINS', []))
 
 
 class CORSMiddleware:
     """
     Simple CORS middleware that allows cross-origin requests.
     """
-    
+
+    # Snapshot of CORS_ALLOWED_ORIGINS, refreshed when the setting changes
+    allowed_origins = frozenset()
+
     def __init__(self, get_response):
         self.get_response = get_response
-    
-    def __call__(self, request):
-        response = self.get_response(request)
-
-        # Get allowed origins from settings
-        from django.conf import settings
-        allowed_origins = getattr(settings, 'CORS_ALLOWED_ORIGINS', [])
+        # Middleware is built once per process; resolve allowed origins here
+        # rather than on every request
+        CORSMiddleware.allowed_origins = _load_allowed_origins()
 
+    def __call__(self, request):
         # Get the request origin
         origin = request.headers.get('Origin')
 
-        # Set CORS headers based on origin
-        if origin and origin in allowed_origins:
+        # Answer preflight requests from allowed origins directly instead of
+        # running the view stack; other preflights reach the view, which may
+        # answer them itself
+        if (request.method == 'OPTIONS' and origin in self.allowed_origins
+                and 'Access-Control-Request-Method' in request.headers):
+            response = HttpResponse(status=204)
+            response['Access-Control-Max-Age'] = PREFLIGHT_MAX_AGE
+        else:
+            response = self.get_response(request)
+
+        # Set CORS headers based on origin; same-origin requests and
+        # disallowed origins get no Allow-Origin header
+        if origin and origin in self.allowed_origins:
             response['Access-Control-Allow-Origin'] = origin
             response['Access-Control-Allow-Credentials'] = 'true'
-        elif not origin:
-            # Same-origin request, no CORS headers needed
-            pass
-        else:
-            # Origin not allowed, don't set CORS headers
-            pass
 
-        response['Access-Control-Allow-Methods'] = (
-            'GET, POST, PUT, DELETE, OPTIONS'
-        )
-        response['Access-Control-Allow-Headers'] = (
-            'Content-Type, Authorization, X-Requested-With, X-CSRFToken'
-        )
+        response['Access-Control-Allow-Methods'] = ALLOW_METHODS
+        response['Access-Control-Allow-Headers'] = ALLOW_HEADERS
+
+        return response
+
 
-        return response
\ No newline at end of file
+@receiver(setting_changed)
+def reload_allowed_origins(setting, **kwargs):
+    """Refresh the origin snapshot when the setting is overridden"""
+    if setting == 'CORS_ALLOWED_ORIGINS':
+        CORSMiddleware.allowed_origins = _load_allowed_origins()
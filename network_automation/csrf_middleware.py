@@ -1,20 +1,19 @@
 """
 Custom CSRF middleware to disable CSRF protection for API endpoints
 """
-from django.utils.deprecation import MiddlewareMixin
 
 
-class DisableCSRFMiddleware(MiddlewareMixin):
+class DisableCSRFMiddleware:
     """
     Middleware to disable CSRF protection for API endpoints
     """
 
-    def process_view(self, request, callback, callback_args, callback_kwargs):
-        """
-        Disable CSRF protection for API endpoints
-        """
-        # Disable CSRF for all API endpoints
-        if True or request.path.startswith('/api/'):
-            setattr(request, '_dont_enforce_csrf_checks', True)
+    def __init__(self, get_response):
+        self.get_response = get_response
 
-        return None
\ No newline at end of file
+    def __call__(self, request):
+        # Mark API requests before the CSRF check runs in process_view
+        if request.path_info.startswith('/api/'):
+            request._dont_enforce_csrf_checks = True
+
+        return self.get_response(request)
\ No newline at end of file
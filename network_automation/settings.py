@@ -135,11 +135,35 @@ SESSION_SAVE_EVERY_REQUEST = True  # Save session on every request
 # Redis Configuration
 REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 
+# Cache Configuration (Redis when CACHE_URL is set, per-process memory otherwise)
+CACHE_URL = config('CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Caches invalidated by model signals are only used when every process
+# (web server and Celery workers) shares the cache. LocMem is per process,
+# so a save in the worker could not clear the web server's copy.
+SHARED_CACHE = bool(CACHE_URL)
+
 # Celery Configuration
 CELERY_BROKER_URL = config('CELERY_BROKER_URL',
                            default='sqla+sqlite:///celery_broker.sqlite3')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND',
                                default='db+sqlite:///celery_results.sqlite3')
+# Redis broker: redeliver unacknowledged tasks after an hour, longer than
+# any workflow run (ignored by the development SQLite broker)
+CELERY_BROKER_TRANSPORT_OPTIONS = {'visibility_timeout': 3600}
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
@@ -149,11 +173,30 @@ CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 # SSH Configuration
 SSH_TIMEOUT = config('SSH_TIMEOUT', default=30, cast=int)
 SSH_PORT = config('SSH_PORT', default=22, cast=int)
+SSH_KNOWN_HOSTS_PATH = config('SSH_KNOWN_HOSTS_PATH', default=str(BASE_DIR / 'known_hosts'))
+# Run show/display/ping/traceroute on exec channels instead of the shell.
+# Exec output has no command echo or prompt, so validation and variable
+# regexes written against shell output may need adjusting; opt in per site.
+SSH_USE_EXEC_CHANNEL = config('SSH_USE_EXEC_CHANNEL', default=False, cast=bool)
+
+# SSH Connection Pool Configuration
+SSH_POOL_IDLE_TIMEOUT = config('CONNECTION_POOL_IDLE_TIMEOUT', default=300, cast=int)
+SSH_POOL_MAX_AGE = config('CONNECTION_POOL_MAX_AGE', default=3600, cast=int)
+SSH_POOL_MAX_SIZE = config('CONNECTION_POOL_MAX_SIZE', default=20, cast=int)
+
+# Maximum devices a single worker drives at once in execute_workflows_batch
+WORKFLOW_BATCH_MAX_CONCURRENT_DEVICES = config('WORKFLOW_BATCH_MAX_CONCURRENT_DEVICES', default=10, cast=int)
 
 # AI Validation Configuration
 AI_API_KEY = config('AI_API_KEY', default='')
 AI_API_URL = config('AI_API_URL', default='')
 
+# Absolute base URL for links back to this server in webhook payloads
+WEBHOOK_BASE_URL = config('WEBHOOK_BASE_URL', default='http://localhost:8000')
+# Link command output from workflow webhook payloads (output_url plus
+# length) instead of embedding it; subscribers must opt in to the new shape
+WEBHOOK_LINK_COMMAND_OUTPUT = config('WEBHOOK_LINK_COMMAND_OUTPUT', default=False, cast=bool)
+
 # Django Channels for WebSocket support
 CHANNEL_LAYERS = {
     "default": {
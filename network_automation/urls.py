@@ -13,6 +13,8 @@ urlpatterns = [
     path('', include('automation.urls')),
 ]
 
+# Development only: in production nginx serves STATIC_ROOT and MEDIA_ROOT
+# (see the Deployment Guide), and static() adds nothing when DEBUG is off
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
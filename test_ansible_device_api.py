@@ -9,12 +9,25 @@ endpoint to execute Ansible playbooks programmatically on specific devices.
 import json
 import requests
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Configuration
 BASE_URL = "http://localhost:8000"
 API_ENDPOINT = f"{BASE_URL}/api/automation/ansible/execute-on-device/"
 
+try:
+    # orjson encodes and decodes the request/response bodies several times
+    # faster; the stdlib json module is used when it isn't installed
+    import orjson
+except ImportError:
+    orjson = None
+
+# One keep-alive session for every request in the script
+SESSION = requests.Session()
+SESSION.headers.update({'Content-Type': 'application/json'})
+SESSION.mount('http://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+
 # Sample Ansible playbook content for testing
 SAMPLE_PLAYBOOK = """---
 - name: Network Device Configuration Check
@@ -45,20 +58,21 @@ SAMPLE_PLAYBOOK = """---
           Custom Variable 2: {{ custom_var_2 | default('not_set') }}
 """
 
+# Default custom variables sent with every request
+DEFAULT_VARS = {
+    "interface_name": "GigabitEthernet0/1",
+    "vlan_id": "100",
+    "custom_var_1": "Test Value 1",
+    "custom_var_2": "Test Value 2"
+}
+
 # Sample request payload templates
 def create_device_execution_request(device_id, custom_vars=None, tags=None, skip_tags=None):
     """Create a request payload for device-specific execution"""
     
-    # Default custom variables
-    default_vars = {
-        "interface_name": "GigabitEthernet0/1",
-        "vlan_id": "100",
-        "custom_var_1": "Test Value 1",
-        "custom_var_2": "Test Value 2"
-    }
-    
-    # Merge with custom variables if provided
-    final_vars = {**default_vars, **(custom_vars or {})}
+    # Merge with custom variables if provided; payloads are only serialized,
+    # so the defaults can be shared when there is nothing to merge
+    final_vars = {**DEFAULT_VARS, **custom_vars} if custom_vars else DEFAULT_VARS
     
     payload = {
         "device_id": device_id,
@@ -74,6 +88,33 @@ def create_device_execution_request(device_id, custom_vars=None, tags=None, skip
     
     return payload
 
+def dump_payload(payload):
+    """Serialize a request payload to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+def load_response(response):
+    """Parse a JSON response body"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def post_concurrently(payloads):
+    """
+    POST every payload to the endpoint at once; the cases are independent,
+    so wall time is the slowest request rather than the sum. Returns a
+    Response, or the RequestException raised, per payload in order.
+    """
+    def post(payload):
+        try:
+            return SESSION.post(API_ENDPOINT, data=dump_payload(payload), timeout=30)
+        except requests.exceptions.RequestException as e:
+            return e
+    
+    with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+        return list(executor.map(post, payloads))
+
 def test_api_endpoint():
     """Test the new API endpoint"""
     print("🚀 Testing Ansible Device-Specific Execution API")
@@ -82,172 +123,143 @@ def test_api_endpoint():
     # Test data
     test_device_id = str(uuid.uuid4())  # This should be replaced with a real device ID
     
+    custom_vars = {
+        "interface_name": "TenGigabitEthernet1/0/1",
+        "vlan_id": "200",
+        "custom_var_1": "Custom Network Config",
+        "custom_var_2": "Production Setting"
+    }
+    
+    payloads = [
+        # Test 1: Basic execution with default variables
+        create_device_execution_request(test_device_id),
+        # Test 2: Execution with custom variables
+        create_device_execution_request(test_device_id, custom_vars=custom_vars),
+        # Test 3: Execution with tags
+        create_device_execution_request(
+            test_device_id, 
+            tags=["configuration", "testing"]
+        ),
+    ]
+    responses = post_concurrently(payloads)
+    
     # Test 1: Basic execution with default variables
     print("\n📋 Test 1: Basic execution with default variables")
     print("-" * 50)
     
-    payload1 = create_device_execution_request(test_device_id)
-    
-    try:
-        response = requests.post(
-            API_ENDPOINT,
-            json=payload1,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
-        
+    response = responses[0]
+    if isinstance(response, requests.exceptions.RequestException):
+        print(f"❌ Request failed: {response}")
+    else:
         print(f"Status Code: {response.status_code}")
         print(f"Response Headers: {dict(response.headers)}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = load_response(response)
             print("✅ Success! Execution completed:")
             print(json.dumps(result, indent=2))
         else:
             print("❌ Error response:")
             print(f"Status: {response.status_code}")
             try:
-                error_data = response.json()
+                error_data = load_response(response)
                 print(json.dumps(error_data, indent=2))
             except:
                 print(response.text)
-                
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request failed: {e}")
     
     # Test 2: Execution with custom variables
     print("\n📋 Test 2: Execution with custom variables")
     print("-" * 50)
     
-    custom_vars = {
-        "interface_name": "TenGigabitEthernet1/0/1",
-        "vlan_id": "200",
-        "custom_var_1": "Custom Network Config",
-        "custom_var_2": "Production Setting"
-    }
-    
-    payload2 = create_device_execution_request(test_device_id, custom_vars=custom_vars)
-    
-    try:
-        response = requests.post(
-            API_ENDPOINT,
-            json=payload2,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
-        
+    response = responses[1]
+    if isinstance(response, requests.exceptions.RequestException):
+        print(f"❌ Request failed: {response}")
+    else:
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = load_response(response)
             print("✅ Success! Execution with custom variables completed:")
             print(json.dumps(result, indent=2))
         else:
             print("❌ Error response:")
             try:
-                error_data = response.json()
+                error_data = load_response(response)
                 print(json.dumps(error_data, indent=2))
             except:
                 print(response.text)
-                
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request failed: {e}")
     
     # Test 3: Execution with tags
     print("\n📋 Test 3: Execution with tags")
     print("-" * 50)
     
-    payload3 = create_device_execution_request(
-        test_device_id, 
-        tags=["configuration", "testing"]
-    )
-    
-    try:
-        response = requests.post(
-            API_ENDPOINT,
-            json=payload3,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
-        
+    response = responses[2]
+    if isinstance(response, requests.exceptions.RequestException):
+        print(f"❌ Request failed: {response}")
+    else:
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = load_response(response)
             print("✅ Success! Execution with tags completed:")
             print(json.dumps(result, indent=2))
         else:
             print("❌ Error response:")
             try:
-                error_data = response.json()
+                error_data = load_response(response)
                 print(json.dumps(error_data, indent=2))
             except:
                 print(response.text)
-                
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request failed: {e}")
 
 def test_error_cases():
     """Test error handling scenarios"""
     print("\n🚨 Testing Error Handling")
     print("=" * 60)
     
-    # Test 1: Missing device_id
-    print("\n📋 Test: Missing device_id")
-    print("-" * 30)
-    
     payload_missing_device = {
         "playbook_content": SAMPLE_PLAYBOOK,
         "variables": {"test_var": "test_value"}
     }
     
-    try:
-        response = requests.post(
-            API_ENDPOINT,
-            json=payload_missing_device,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
-        
+    payload_invalid_device = {
+        "device_id": "invalid-uuid-format",
+        "playbook_content": SAMPLE_PLAYBOOK,
+        "variables": {}
+    }
+    
+    responses = post_concurrently([payload_missing_device, payload_invalid_device])
+    
+    # Test 1: Missing device_id
+    print("\n📋 Test: Missing device_id")
+    print("-" * 30)
+    
+    response = responses[0]
+    if isinstance(response, requests.exceptions.RequestException):
+        print(f"❌ Request failed: {response}")
+    else:
         print(f"Status Code: {response.status_code}")
         if response.status_code == 400:
-            error_data = response.json()
+            error_data = load_response(response)
             print("✅ Correctly caught missing device_id error:")
             print(json.dumps(error_data, indent=2))
         else:
             print("❌ Unexpected response")
-            
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request failed: {e}")
     
     # Test 2: Invalid device_id
     print("\n📋 Test: Invalid device_id")
     print("-" * 30)
     
-    payload_invalid_device = {
-        "device_id": "invalid-uuid-format",
-        "playbook_content": SAMPLE_PLAYBOOK,
-        "variables": {}
-    }
-    
-    try:
-        response = requests.post(
-            API_ENDPOINT,
-            json=payload_invalid_device,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
-        
+    response = responses[1]
+    if isinstance(response, requests.exceptions.RequestException):
+        print(f"❌ Request failed: {response}")
+    else:
         print(f"Status Code: {response.status_code}")
         if response.status_code == 404:
-            error_data = response.json()
+            error_data = load_response(response)
             print("✅ Correctly caught invalid device_id error:")
             print(json.dumps(error_data, indent=2))
         else:
             print("❌ Unexpected response")
-            
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request failed: {e}")
 
 def display_api_documentation():
     """Display comprehensive API documentation"""
@@ -4,23 +4,53 @@ Celery Configuration Test Script
 This script tests if Celery is properly configured and can connect to the broker.
 """
 
+import functools
 import os
+import sqlite3
 import sys
 import django
 from pathlib import Path
+from urllib.parse import urlparse
 
 # Add the project root to Python path
 project_root = Path(__file__).resolve().parent
 sys.path.insert(0, str(project_root))
 
-# Set up Django
+# Django settings; setup happens only when the script is run
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'network_automation.settings')
-django.setup()
 
 import celery
-from celery import Celery
 from django.conf import settings
 
+# Broker and result backend URLs don't change while the process runs;
+# parse them once
+BROKER_PARSED = urlparse(settings.CELERY_BROKER_URL)
+RESULT_PARSED = urlparse(settings.CELERY_RESULT_BACKEND)
+BROKER_DB_PATH = (Path(BROKER_PARSED.path.lstrip('/'))
+                  if BROKER_PARSED.scheme == 'sqla+sqlite' else None)
+RESULT_DB_PATH = (Path(RESULT_PARSED.path.lstrip('/'))
+                  if RESULT_PARSED.scheme == 'db+sqlite' else None)
+
+
+@functools.cache
+def db_exists(db_path):
+    """Whether a SQLite database file exists, checked once per path"""
+    return db_path.exists()
+
+
+def sqlite_journal_mode(db_path):
+    """
+    Read the journal mode of an existing SQLite broker/result database.
+    The file is opened read-only; WAL is set by the Celery engines when
+    they connect (see network_automation/celery.py).
+    """
+    conn = sqlite3.connect(f'{db_path.resolve().as_uri()}?mode=ro', uri=True)
+    try:
+        return conn.execute('PRAGMA journal_mode').fetchone()[0]
+    finally:
+        conn.close()
+
+
 def test_celery_config():
     """Test Celery configuration and connectivity."""
     print("=" * 60)
@@ -29,7 +59,9 @@ def test_celery_config():
     
     # Test 1: Check Celery app creation
     try:
-        app = celery.Celery('network_automation')
+        # Task modules are listed here and only imported when the tasks
+        # are enumerated below
+        app = celery.Celery('network_automation', include=['automation.tasks'])
         print("✅ Celery app created successfully")
     except Exception as e:
         print(f"❌ Failed to create Celery app: {e}")
@@ -37,35 +69,35 @@ def test_celery_config():
     
     # Test 2: Check Django settings
     try:
-        broker_url = settings.CELERY_BROKER_URL
-        result_backend = settings.CELERY_RESULT_BACKEND
-        print(f"✅ Broker URL configured: {broker_url}")
-        print(f"✅ Result Backend configured: {result_backend}")
+        print(f"✅ Broker URL configured: {BROKER_PARSED.geturl()}")
+        print(f"✅ Result Backend configured: {RESULT_PARSED.geturl()}")
     except Exception as e:
         print(f"❌ Failed to read Django settings: {e}")
         return False
     
     # Test 3: Check if broker database files exist or can be created
     try:
-        from urllib.parse import urlparse
-        
         # Check broker database
-        broker_parsed = urlparse(broker_url)
-        if broker_parsed.scheme == 'sqla+sqlite':
-            broker_db_path = Path(broker_parsed.path.lstrip('/'))
-            if broker_db_path.exists():
-                print(f"✅ Broker database exists: {broker_db_path}")
+        if BROKER_DB_PATH is not None:
+            # SQLite takes a write lock for every enqueue and dequeue, so it
+            # is only acceptable as a development broker
+            if not settings.DEBUG:
+                print("❌ SQLite broker configured with DEBUG off; set CELERY_BROKER_URL=redis://...")
+                return False
+            print("⚠️  SQLite broker is for development only; use Redis in production")
+            if db_exists(BROKER_DB_PATH):
+                print(f"✅ Broker database exists: {BROKER_DB_PATH}")
+                print(f"✅ Broker journal mode: {sqlite_journal_mode(BROKER_DB_PATH)}")
             else:
-                print(f"ℹ️  Broker database will be created: {broker_db_path}")
+                print(f"ℹ️  Broker database will be created: {BROKER_DB_PATH}")
         
         # Check result backend database
-        result_parsed = urlparse(result_backend)
-        if result_parsed.scheme == 'db+sqlite':
-            result_db_path = Path(result_parsed.path.lstrip('/'))
-            if result_db_path.exists():
-                print(f"✅ Result backend database exists: {result_db_path}")
+        if RESULT_DB_PATH is not None:
+            if db_exists(RESULT_DB_PATH):
+                print(f"✅ Result backend database exists: {RESULT_DB_PATH}")
+                print(f"✅ Result backend journal mode: {sqlite_journal_mode(RESULT_DB_PATH)}")
             else:
-                print(f"ℹ️  Result backend database will be created: {result_db_path}")
+                print(f"ℹ️  Result backend database will be created: {RESULT_DB_PATH}")
                 
     except Exception as e:
         print(f"⚠️  Could not check database files: {e}")
@@ -81,8 +113,8 @@ def test_celery_config():
     
     # Test 5: List available tasks
     try:
-        # Import tasks module to register tasks
-        import automation.tasks
+        # Import the app's include modules to register tasks
+        app.loader.import_default_modules()
         print("✅ Tasks module imported successfully")
         
         # Get registered tasks
@@ -113,5 +145,6 @@ def test_celery_config():
     return True
 
 if __name__ == "__main__":
+    django.setup()
     success = test_celery_config()
     sys.exit(0 if success else 1)
\ No newline at end of file
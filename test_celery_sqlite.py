@@ -5,21 +5,19 @@ Test script to verify Celery with SQLite configuration
 import os
 import sys
 import django
+from pathlib import Path
 
-# Add the project directory to Python path
-sys.path.insert(0, '/Users/admin/Desktop/projects/networkautomation')
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent
+sys.path.insert(0, str(project_root))
 
-# Set Django settings
+# Set Django settings; setup happens only when the script is run
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'network_automation.settings')
-django.setup()
-
-from celery import Celery
-from automation.tasks import *  # Import your tasks
-import time
 
 def test_celery_config():
     """Test Celery configuration"""
     from network_automation.celery import app
+    import automation.tasks  # noqa: F401  registers the tasks listed below
     
     print("=== Celery Configuration Test ===")
     print(f"Broker URL: {app.conf.broker_url}")
@@ -76,5 +74,6 @@ def test_simple_task():
         print(f"Error sending task: {e}")
 
 if __name__ == "__main__":
+    django.setup()
     test_celery_config()
     test_simple_task()
\ No newline at end of file
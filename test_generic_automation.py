@@ -10,73 +10,155 @@ metadata and workflow type.
 import requests
 import json
 import sys
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+
+try:
+    # orjson encodes and decodes the request/response bodies several times
+    # faster; the stdlib json module is used when it isn't installed
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration
 BASE_URL = "http://localhost:8000/api/automation"
 
-def test_generic_automation():
+# Last mappings response, revalidated with its ETag on the next run
+MAPPINGS_CACHE = Path.home() / ".cache" / "netauto_tests" / "mappings.json"
+
+def load_cached_mappings():
+    """Return the cached {"etag", "body"} for the mappings list, if any"""
+    try:
+        return json.loads(MAPPINGS_CACHE.read_text())
+    except (OSError, ValueError):
+        return None
+
+def save_cached_mappings(etag, body):
+    """Store the mappings list with its ETag for the next run"""
+    try:
+        MAPPINGS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        MAPPINGS_CACHE.write_text(json.dumps({"etag": etag, "body": body}))
+    except OSError:
+        pass
+
+def dump_payload(payload):
+    """Serialize a request payload to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+def load_response(response):
+    """Parse a JSON response body"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# Generic automation scenarios, serialized once into the batch request body
+GENERIC_SCENARIOS = [
+    # Test 1: Device not found
+    {
+        "hostname": "non-existent-device",
+        "workflow": "reboot",
+        "params": {"delay": 300}
+    },
+    # Test 2: No mapping found
+    {
+        "hostname": "sw-core-01",
+        "workflow": "unknown_workflow",
+        "params": {}
+    },
+    # Test 3: Missing required parameters
+    {
+        "hostname": "sw-core-01",
+        "workflow": "vlan_add",
+        "params": {
+            "vlan_name": "SALES"
+            # Missing vlan_id and ports
+        }
+    },
+    # Test 4: Successful execution
+    {
+        "hostname": "sw-core-01",
+        "workflow": "reboot",
+        "params": {
+            "delay": 300,
+            "save_config": True
+        }
+    },
+    # Test 5: VLAN add workflow
+    {
+        "hostname": "sw-access-12",
+        "workflow": "vlan_add",
+        "params": {
+            "vlan_id": 120,
+            "vlan_name": "SALES",
+            "ports": ["Gi1/0/10", "Gi1/0/11"]
+        }
+    },
+]
+BATCH_BODY = dump_payload({"items": GENERIC_SCENARIOS})
+
+# Result of the one-shot reachability probe, shared by every entry point
+_server_reachable = None
+
+def preflight(session, url):
+    """
+    Probe the server once with a short HEAD so an unreachable server fails
+    in about a second instead of timing out on every test case. Any HTTP
+    response, including 404/405, counts as reachable.
+    """
+    global _server_reachable
+    if _server_reachable is None:
+        try:
+            session.head(url, timeout=1.0)
+            _server_reachable = True
+        except requests.exceptions.RequestException:
+            _server_reachable = False
+    return _server_reachable
+
+def post_batch(session):
+    """
+    Send every scenario to the batch endpoint in a single POST and return
+    the (status, result) pairs in request order.
+    """
+    response = session.post(
+        f"{BASE_URL}/generic/batch/",
+        data=BATCH_BODY,
+        headers={"Content-Type": "application/json"}
+    )
+    response.raise_for_status()
+    return [(entry["status"], entry["result"]) for entry in load_response(response)["results"]]
+
+def test_generic_automation(session):
     """Test the generic automation endpoint"""
     
     print("=== Generic Automation Endpoint Test ===\\n")
     
+    results = post_batch(session)
+    
     # Test 1: Device not found
     print("1. Testing device not found scenario...")
-    response = requests.post(
-        f"{BASE_URL}/generic/",
-        json={
-            "hostname": "non-existent-device",
-            "workflow": "reboot",
-            "params": {"delay": 300}
-        }
-    )
-    print(f"Status: {response.status_code}")
-    print(f"Response: {response.json()}\\n")
+    status, result = results[0]
+    print(f"Status: {status}")
+    print(f"Response: {result}\\n")
     
     # Test 2: No mapping found
     print("2. Testing no mapping found scenario...")
-    response = requests.post(
-        f"{BASE_URL}/generic/",
-        json={
-            "hostname": "sw-core-01",
-            "workflow": "unknown_workflow",
-            "params": {}
-        }
-    )
-    print(f"Status: {response.status_code}")
-    print(f"Response: {response.json()}\\n")
+    status, result = results[1]
+    print(f"Status: {status}")
+    print(f"Response: {result}\\n")
     
     # Test 3: Missing required parameters
     print("3. Testing missing required parameters...")
-    response = requests.post(
-        f"{BASE_URL}/generic/",
-        json={
-            "hostname": "sw-core-01",
-            "workflow": "vlan_add",
-            "params": {
-                "vlan_name": "SALES"
-                # Missing vlan_id and ports
-            }
-        }
-    )
-    print(f"Status: {response.status_code}")
-    print(f"Response: {response.json()}\\n")
+    status, result = results[2]
+    print(f"Status: {status}")
+    print(f"Response: {result}\\n")
     
     # Test 4: Successful execution (this will depend on your test data)
     print("4. Testing successful execution...")
-    response = requests.post(
-        f"{BASE_URL}/generic/",
-        json={
-            "hostname": "sw-core-01",
-            "workflow": "reboot",
-            "params": {
-                "delay": 300,
-                "save_config": True
-            }
-        }
-    )
-    print(f"Status: {response.status_code}")
-    if response.status_code == 202:
-        result = response.json()
+    status, result = results[3]
+    print(f"Status: {status}")
+    if status == 202:
         print(f"Success! Execution started:")
         print(f"  Execution ID: {result['execution_id']}")
         print(f"  Task ID: {result['task_id']}")
@@ -86,45 +168,42 @@ def test_generic_automation():
         print(f"  Mapping: {result['mapping_used']['name']}")
         print(f"  Variables: {result['variables_used']}")
     else:
-        print(f"Response: {response.json()}")
+        print(f"Response: {result}")
     print()
     
     # Test 5: VLAN add workflow
     print("5. Testing VLAN add workflow...")
-    response = requests.post(
-        f"{BASE_URL}/generic/",
-        json={
-            "hostname": "sw-access-12",
-            "workflow": "vlan_add",
-            "params": {
-                "vlan_id": 120,
-                "vlan_name": "SALES",
-                "ports": ["Gi1/0/10", "Gi1/0/11"]
-            }
-        }
-    )
-    print(f"Status: {response.status_code}")
-    if response.status_code == 202:
-        result = response.json()
+    status, result = results[4]
+    print(f"Status: {status}")
+    if status == 202:
         print(f"Success! VLAN add execution started:")
         print(f"  Execution ID: {result['execution_id']}")
         print(f"  Device: {result['device_info']['hostname']}")
         print(f"  VLAN ID: {result['variables_used'].get('vlan_id')}")
         print(f"  VLAN Name: {result['variables_used'].get('vlan_name')}")
     else:
-        print(f"Response: {response.json()}")
+        print(f"Response: {result}")
     print()
 
-def test_mappings_endpoint():
+def test_mappings_endpoint(session):
     """Test the device-playbook mappings endpoint"""
     
     print("=== Device-Playbook Mappings Test ===\\n")
     
-    response = requests.get(f"{BASE_URL}/mappings/")
+    cached = load_cached_mappings()
+    headers = {"If-None-Match": cached["etag"]} if cached else {}
+    response = session.get(f"{BASE_URL}/mappings/", headers=headers)
     print(f"Status: {response.status_code}")
     
-    if response.status_code == 200:
-        result = response.json()
+    if response.status_code == 304:
+        print("Mappings unchanged since the last run; using the cached list")
+        result = cached["body"]
+    elif response.status_code == 200:
+        result = load_response(response)
+        if response.headers.get("ETag"):
+            save_cached_mappings(response.headers["ETag"], result)
+    
+    if response.status_code in (200, 304):
         print(f"Found {result['total']} mappings:")
         for mapping in result['mappings']:
             print(f"  - {mapping['name']} ({mapping['workflow_type']})")
@@ -136,7 +215,7 @@ def test_mappings_endpoint():
             print(f"    Active: {mapping['is_active']}")
             print()
     else:
-        print(f"Response: {response.json()}")
+        print(f"Response: {load_response(response)}")
 
 def create_sample_data():
     """Create sample data for testing (requires Django shell)"""
@@ -145,6 +224,7 @@ def create_sample_data():
     print("To create sample data, run these commands in Django shell:")
     print("""
 from django.contrib.auth.models import User
+from django.db import transaction
 from automation.models import Device, AnsiblePlaybook, DevicePlaybookMapping
 
 # Create a test user
@@ -153,34 +233,37 @@ user, created = User.objects.get_or_create(
     defaults={'email': 'test@example.com'}
 )
 
-# Create test devices
-device1 = Device.objects.create(
-    name="Core Switch 01",
-    hostname="sw-core-01",
-    ip_address="192.168.1.10",
-    device_type="switch",
-    vendor="Cisco",
-    model="Catalyst 2960X",
-    os_version="15.2(7)E10",
-    created_by=user
-)
-
-device2 = Device.objects.create(
-    name="Access Switch 12",
-    hostname="sw-access-12",
-    ip_address="192.168.1.12",
-    device_type="switch",
-    vendor="Cisco",
-    model="Catalyst 2960X",
-    os_version="15.2(7)E10",
-    created_by=user
-)
-
-# Create test playbooks
-reboot_playbook = AnsiblePlaybook.objects.create(
-    name="Device Reboot Playbook",
-    description="Playbook to reboot network devices",
-    playbook_content='''
+with transaction.atomic():
+    # Create test devices
+    device1, device2 = Device.objects.bulk_create([
+        Device(
+            name="Core Switch 01",
+            hostname="sw-core-01",
+            ip_address="192.168.1.10",
+            device_type="switch",
+            vendor="Cisco",
+            model="Catalyst 2960X",
+            os_version="15.2(7)E10",
+            created_by=user
+        ),
+        Device(
+            name="Access Switch 12",
+            hostname="sw-access-12",
+            ip_address="192.168.1.12",
+            device_type="switch",
+            vendor="Cisco",
+            model="Catalyst 2960X",
+            os_version="15.2(7)E10",
+            created_by=user
+        ),
+    ])
+    
+    # Create test playbooks
+    reboot_playbook, vlan_playbook = AnsiblePlaybook.objects.bulk_create([
+        AnsiblePlaybook(
+            name="Device Reboot Playbook",
+            description="Playbook to reboot network devices",
+            playbook_content='''
 ---
 - name: Reboot Network Device
   hosts: network_devices
@@ -203,13 +286,12 @@ reboot_playbook = AnsiblePlaybook.objects.create(
       args:
         confirm: yes
     ''',
-    created_by=user
-)
-
-vlan_playbook = AnsiblePlaybook.objects.create(
-    name="VLAN Management Playbook",
-    description="Playbook to add/remove VLANs",
-    playbook_content='''
+            created_by=user
+        ),
+        AnsiblePlaybook(
+            name="VLAN Management Playbook",
+            description="Playbook to add/remove VLANs",
+            playbook_content='''
 ---
 - name: VLAN Management
   hosts: network_devices
@@ -234,56 +316,61 @@ vlan_playbook = AnsiblePlaybook.objects.create(
       loop: "{{ ports }}"
       when: ports|length > 0
     ''',
-    created_by=user
-)
-
-# Create mappings
-mapping1 = DevicePlaybookMapping.objects.create(
-    name="Cisco Switch Reboot",
-    description="Reboot playbook for Cisco switches",
-    vendor="Cisco",
-    model="Catalyst 2960X",
-    os_version="15.2(7)E10",
-    device_type="switch",
-    workflow_type="reboot",
-    playbook=reboot_playbook,
-    priority=100,
-    is_active=True,
-    default_variables='{"reboot_delay": 300, "save_config": true}',
-    required_params='[]',
-    created_by=user
-)
-
-mapping2 = DevicePlaybookMapping.objects.create(
-    name="Cisco Switch VLAN Management",
-    description="VLAN management for Cisco switches",
-    vendor="Cisco",
-    model="Catalyst 2960X",
-    os_version="15.2(7)E10",
-    device_type="switch",
-    workflow_type="vlan_add",
-    playbook=vlan_playbook,
-    priority=100,
-    is_active=True,
-    default_variables='{}',
-    required_params='["vlan_id", "vlan_name", "ports"]',
-    created_by=user
-)
-
-# Alternatively, create mappings for specific devices
-mapping3 = DevicePlaybookMapping.objects.create(
-    name="Specific Device Reboot - Core Switch",
-    description="Reboot playbook for core switch only",
-    workflow_type="reboot",
-    playbook=reboot_playbook,
-    priority=200,  # Higher priority than metadata-based mappings
-    is_active=True,
-    default_variables='{"reboot_delay": 600}',  # Longer delay for core switch
-    required_params='[]',
-    created_by=user
-)
-# Add specific device to the mapping
-mapping3.target_devices.add(device1)
+            created_by=user
+        ),
+    ])
+    
+    # Create mappings
+    mapping1, mapping2, mapping3 = DevicePlaybookMapping.objects.bulk_create([
+        DevicePlaybookMapping(
+            name="Cisco Switch Reboot",
+            description="Reboot playbook for Cisco switches",
+            vendor="Cisco",
+            model="Catalyst 2960X",
+            os_version="15.2(7)E10",
+            device_type="switch",
+            workflow_type="reboot",
+            playbook=reboot_playbook,
+            priority=100,
+            is_active=True,
+            default_variables='{"reboot_delay": 300, "save_config": true}',
+            required_params='[]',
+            created_by=user
+        ),
+        DevicePlaybookMapping(
+            name="Cisco Switch VLAN Management",
+            description="VLAN management for Cisco switches",
+            vendor="Cisco",
+            model="Catalyst 2960X",
+            os_version="15.2(7)E10",
+            device_type="switch",
+            workflow_type="vlan_add",
+            playbook=vlan_playbook,
+            priority=100,
+            is_active=True,
+            default_variables='{}',
+            required_params='["vlan_id", "vlan_name", "ports"]',
+            created_by=user
+        ),
+        # Alternatively, create mappings for specific devices
+        DevicePlaybookMapping(
+            name="Specific Device Reboot - Core Switch",
+            description="Reboot playbook for core switch only",
+            workflow_type="reboot",
+            playbook=reboot_playbook,
+            priority=200,  # Higher priority than metadata-based mappings
+            is_active=True,
+            default_variables='{"reboot_delay": 600}',  # Longer delay for core switch
+            required_params='[]',
+            created_by=user
+        ),
+    ])
+    
+    # Add specific device to the mapping
+    TargetDevice = DevicePlaybookMapping.target_devices.through
+    TargetDevice.objects.bulk_create([
+        TargetDevice(deviceplaybookmapping_id=mapping3.id, device_id=device1.id),
+    ])
 
 print(f"Created devices: {device1.name}, {device2.name}")
 print(f"Created playbooks: {reboot_playbook.name}, {vlan_playbook.name}")
@@ -300,20 +387,31 @@ def main():
         create_sample_data()
         return
     
-    try:
-        test_mappings_endpoint()
-        test_generic_automation()
-        
-        print("=== Test Complete ===")
-        print("To create sample test data, run:")
-        print("python test_generic_automation.py --create-data")
+    # One keep-alive session so the sequential requests reuse a connection
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    
+    with session:
+        if not preflight(session, f"{BASE_URL}/mappings/"):
+            print("Error: Could not connect to the API server.")
+            print("Make sure the Django development server is running:")
+            print("python manage.py runserver")
+            sys.exit(1)
         
-    except requests.exceptions.ConnectionError:
-        print("Error: Could not connect to the API server.")
-        print("Make sure the Django development server is running:")
-        print("python manage.py runserver")
-    except Exception as e:
-        print(f"Error during testing: {e}")
+        try:
+            test_mappings_endpoint(session)
+            test_generic_automation(session)
+            
+            print("=== Test Complete ===")
+            print("To create sample test data, run:")
+            print("python test_generic_automation.py --create-data")
+            
+        except requests.exceptions.ConnectionError:
+            print("Error: Could not connect to the API server.")
+            print("Make sure the Django development server is running:")
+            print("python manage.py runserver")
+        except Exception as e:
+            print(f"Error during testing: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,87 +4,150 @@ Test script for the updated Ansible Device API with playbook_id
 """
 import requests
 import json
-import uuid
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+try:
+    # orjson encodes and decodes the request/response bodies several times
+    # faster; the stdlib json module is used when it isn't installed
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration
 API_URL = "http://localhost:8000/api/automation/ansible/execute-on-device/"
 TEST_DEVICE_ID = "123e4567-e89b-12d3-a456-426614174000"  # Replace with actual device ID
 TEST_PLAYBOOK_ID = "456e7890-e89b-12d3-a456-426614174001"  # Replace with actual playbook ID
 
-def test_api_with_playbook_id():
+def dump_payload(payload):
+    """Serialize a request payload to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+def load_response(response):
+    """Parse a JSON response body"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# Full indented responses only with --verbose; otherwise a short preview
+VERBOSE = "--verbose" in sys.argv
+
+def format_result(result):
+    """Render a response body for printing"""
+    if VERBOSE:
+        return json.dumps(result, indent=2)
+    return f"{result!r:.200}"
+
+# Test cases, built once; their request bodies are serialized up front
+TEST_CASES = [
+    {
+        "name": "Basic Execution",
+        "data": {
+            "device_id": TEST_DEVICE_ID,
+            "playbook_id": TEST_PLAYBOOK_ID,
+            "variables": {"test_var": "test_value"}
+        }
+    },
+    {
+        "name": "With Custom Variables",
+        "data": {
+            "device_id": TEST_DEVICE_ID,
+            "playbook_id": TEST_PLAYBOOK_ID,
+            "variables": {
+                "interface_name": "GigabitEthernet0/1",
+                "vlan_id": "100",
+                "custom_setting": "production"
+            }
+        }
+    },
+    {
+        "name": "With Tags",
+        "data": {
+            "device_id": TEST_DEVICE_ID,
+            "playbook_id": TEST_PLAYBOOK_ID,
+            "variables": {"test_mode": True},
+            "tags": ["configuration", "testing"],
+            "skip_tags": ["debug"]
+        }
+    },
+    {
+        "name": "Missing playbook_id (should fail)",
+        "data": {
+            "device_id": TEST_DEVICE_ID,
+            "variables": {"test_var": "test_value"}
+        },
+        "should_fail": True
+    },
+    {
+        "name": "Invalid playbook_id (should fail)",
+        "data": {
+            "device_id": TEST_DEVICE_ID,
+            "playbook_id": "invalid-uuid",
+            "variables": {"test_var": "test_value"}
+        },
+        "should_fail": True
+    }
+]
+TEST_CASE_BODIES = [dump_payload(test_case['data']) for test_case in TEST_CASES]
+
+def post_concurrently(session, bodies):
+    """
+    POST every pre-serialized body at once; the cases are independent, so
+    wall time is the slowest request rather than the sum. Returns a
+    Response, or the RequestException raised, per body in order.
+    """
+    def post(body):
+        try:
+            return session.post(API_URL, data=body, timeout=30)
+        except requests.exceptions.RequestException as e:
+            return e
+    
+    with ThreadPoolExecutor(max_workers=len(bodies)) as executor:
+        return list(executor.map(post, bodies))
+
+# Result of the one-shot reachability probe, shared by every entry point
+_server_reachable = None
+
+def preflight(session, url):
+    """
+    Probe the server once with a short HEAD so an unreachable server fails
+    in about a second instead of timing out on every test case. Any HTTP
+    response, including 404/405, counts as reachable.
+    """
+    global _server_reachable
+    if _server_reachable is None:
+        try:
+            session.head(url, timeout=1.0)
+            _server_reachable = True
+        except requests.exceptions.RequestException:
+            _server_reachable = False
+    return _server_reachable
+
+def test_api_with_playbook_id(session):
     """Test the API with the new playbook_id format"""
     
     print("Testing Updated Ansible Device API")
     print("=" * 50)
     
-    # Test data
-    test_cases = [
-        {
-            "name": "Basic Execution",
-            "data": {
-                "device_id": TEST_DEVICE_ID,
-                "playbook_id": TEST_PLAYBOOK_ID,
-                "variables": {"test_var": "test_value"}
-            }
-        },
-        {
-            "name": "With Custom Variables",
-            "data": {
-                "device_id": TEST_DEVICE_ID,
-                "playbook_id": TEST_PLAYBOOK_ID,
-                "variables": {
-                    "interface_name": "GigabitEthernet0/1",
-                    "vlan_id": "100",
-                    "custom_setting": "production"
-                }
-            }
-        },
-        {
-            "name": "With Tags",
-            "data": {
-                "device_id": TEST_DEVICE_ID,
-                "playbook_id": TEST_PLAYBOOK_ID,
-                "variables": {"test_mode": True},
-                "tags": ["configuration", "testing"],
-                "skip_tags": ["debug"]
-            }
-        },
-        {
-            "name": "Missing playbook_id (should fail)",
-            "data": {
-                "device_id": TEST_DEVICE_ID,
-                "variables": {"test_var": "test_value"}
-            },
-            "should_fail": True
-        },
-        {
-            "name": "Invalid playbook_id (should fail)",
-            "data": {
-                "device_id": TEST_DEVICE_ID,
-                "playbook_id": "invalid-uuid",
-                "variables": {"test_var": "test_value"}
-            },
-            "should_fail": True
-        }
-    ]
+    responses = post_concurrently(session, TEST_CASE_BODIES)
     
-    for test_case in test_cases:
+    for test_case, response in zip(TEST_CASES, responses):
         print(f"\n{test_case['name']}:")
         print("-" * 30)
         
+        if isinstance(response, requests.exceptions.RequestException):
+            print(f"❌ Request failed: {response}")
+            continue
+        
         try:
-            response = requests.post(
-                API_URL,
-                json=test_case['data'],
-                headers={'Content-Type': 'application/json'},
-                timeout=30
-            )
-            
             print(f"Status Code: {response.status_code}")
             
             if response.headers.get('content-type', '').startswith('application/json'):
-                result = response.json()
-                print(f"Response: {json.dumps(result, indent=2)}")
+                result = load_response(response)
+                print(f"Response: {format_result(result)}")
                 
                 # Check if test behaved as expected
                 if test_case.get('should_fail', False):
@@ -100,8 +163,6 @@ def test_api_with_playbook_id():
             else:
                 print(f"Response: {response.text}")
                 
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Request failed: {e}")
         except Exception as e:
             print(f"❌ Unexpected error: {e}")
     
@@ -110,7 +171,7 @@ def test_api_with_playbook_id():
     print("\nNote: Replace TEST_DEVICE_ID and TEST_PLAYBOOK_ID with actual IDs")
     print("from your database for full testing.")
 
-def test_documentation_examples():
+def test_documentation_examples(session):
     """Test the examples from the documentation"""
     
     print("\n\nTesting Documentation Examples")
@@ -131,18 +192,17 @@ def test_documentation_examples():
     print(f"Data: {json.dumps(example_data, indent=2)}")
     
     try:
-        response = requests.post(
+        response = session.post(
             API_URL,
-            json=example_data,
-            headers={'Content-Type': 'application/json'},
+            data=dump_payload(example_data),
             timeout=30
         )
         
         print(f"Status Code: {response.status_code}")
         
         if response.headers.get('content-type', '').startswith('application/json'):
-            result = response.json()
-            print(f"Response: {json.dumps(result, indent=2)}")
+            result = load_response(response)
+            print(f"Response: {format_result(result)}")
         else:
             print(f"Response: {response.text}")
             
@@ -157,6 +217,15 @@ if __name__ == "__main__":
     print("1. Django server is running on localhost:8000")
     print("2. You have created test devices and playbooks in the database")
     print("3. Replace the TEST_DEVICE_ID and TEST_PLAYBOOK_ID variables with actual IDs")
+    print("\nPass --verbose to print full responses.")
     
-    test_api_with_playbook_id()
-    test_documentation_examples()
\ No newline at end of file
+    # One keep-alive session so every test case reuses the same connection
+    with requests.Session() as session:
+        session.headers.update({'Content-Type': 'application/json'})
+        session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        if not preflight(session, API_URL):
+            print("\n❌ Could not reach the API server at localhost:8000")
+            print("Start it with: python manage.py runserver")
+            sys.exit(1)
+        test_api_with_playbook_id(session)
+        test_documentation_examples(session)
\ No newline at end of file